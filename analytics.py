@@ -0,0 +1,69 @@
+"""
+Metrik turunan untuk membandingkan vendor: harga per gram, spread beli-buyback (%) dan vendor
+termurah per gramasi. Dihitung sekali saat baris masuk store (PriceStore.save / bulk_load) dan
+disimpan di tabel price_stats yang ber-key (gram, tanggal), jadi /best cukup 1 lookup index.
+
+    price_per_gram(5, 7_100_000)        -> 1420000.0
+    spread_pct(1_420_000, 1_300_000)    -> 8.45   (% dari harga beli)
+"""
+import os
+from typing import Iterable, List, Optional, Tuple
+
+# (vendor_id, vendor, gram, tanggal, crawled_at, harga_beli, harga_buyback) -> urutan store.COLUMNS
+StoreRow = Tuple[str, str, float, str, str, int, int]
+
+# /best tanpa tanggal: harga vendor yang lebih tua dari N hari sebelum tanggal terbaru tidak ikut dibandingkan
+BEST_WINDOW_DAYS = int(os.environ.get("BEST_WINDOW_DAYS", "7"))
+
+
+def price_per_gram(gram: float, harga_beli: int) -> Optional[float]:
+    return harga_beli / gram if gram > 0 and harga_beli > 0 else None
+
+
+def spread_pct(harga_beli: int, harga_buyback: int) -> Optional[float]:
+    """Selisih harga beli dan buyback sebagai persen harga beli (None kalau salah satu tidak ada)."""
+    if harga_beli > 0 and harga_buyback > 0:
+        return (harga_beli - harga_buyback) * 100.0 / harga_beli
+    return None
+
+
+def stats_params(rows: Iterable[StoreRow]) -> List[tuple]:
+    """Baris store -> parameter insert price_stats (kolom store.STATS_COLUMNS)."""
+    return [(gram, tanggal, vendor_id, vendor, crawled_at, beli, buyback,
+             price_per_gram(gram, beli), spread_pct(beli, buyback))
+            for vendor_id, vendor, gram, tanggal, crawled_at, beli, buyback in rows]
+
+
+def _entry(r: dict) -> dict:
+    return {
+        "vendor_id": r["vendor_id"],
+        "Vendor": r["vendor"],
+        "Tanggal": r["tanggal"],
+        "Harga Beli": r["harga_beli"],
+        "Harga Buyback": r["harga_buyback"],
+        "Harga per Gram": round(r["price_per_gram"], 2) if r["price_per_gram"] is not None else None,
+        "Spread %": round(r["spread_pct"], 2) if r["spread_pct"] is not None else None,
+    }
+
+
+def best(gram: float, tanggal: Optional[str] = None, store=None) -> dict:
+    """
+    Perbandingan vendor untuk 1 gramasi. Tanpa tanggal: harga terakhir tiap vendor dalam
+    BEST_WINDOW_DAYS hari sebelum tanggal terbaru gramasi ini.
+    'cheapest' = harga beli terendah, 'best_buyback' = buyback tertinggi, 'tightest_spread' = spread terkecil.
+    """
+    if store is None:
+        from store import get_store
+        store = get_store()
+    rows = [_entry(r) for r in store.gram_stats(gram, tanggal, BEST_WINDOW_DAYS)]
+    beli = [r for r in rows if r["Harga Beli"] > 0]
+    buyback = [r for r in rows if r["Harga Buyback"] > 0]
+    spread = [r for r in rows if r["Spread %"] is not None]
+    return {
+        "gram": gram,
+        "tanggal": tanggal,
+        "cheapest": min(beli, key=lambda r: r["Harga Beli"]) if beli else None,
+        "best_buyback": max(buyback, key=lambda r: r["Harga Buyback"]) if buyback else None,
+        "tightest_spread": min(spread, key=lambda r: r["Spread %"]) if spread else None,
+        "vendors": rows,
+    }
@@ -1,32 +1,65 @@
-from flask import Flask, render_template, jsonify
-import importlib
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+import json
+from datetime import datetime
 import sys
 import os
 
-# Menambahkan folder saat ini ke path agar importlib bisa menemukan modul lokal di serverless environment
+# Menambahkan folder saat ini ke path agar registry vendor (importlib) bisa menemukan modul lokal di serverless environment
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import analytics
+from cache import PriceCache
+import export
+import metrics
+from orchestrator import iter_crawl
+from records import json_default
+from responses import compact_rows, json_response, wants_compact
+from store import get_store
+from vendors import VENDORS, get_vendor
+
 app = Flask(__name__)
 
-def get_full_data(vendor):
+# Cache hasil crawl per vendor (TTL + stale-while-revalidate + single-flight)
+# supaya tiap page view tidak memicu scrape ulang ke situs vendor
+price_cache = PriceCache()
+
+# PRICE_SCHEDULER=1: crawl ulang tiap vendor di background dan isi price_cache,
+# jadi /get_price cukup membaca memory. Tidak untuk Vercel (proses tidak hidup terus).
+if os.environ.get('PRICE_SCHEDULER') == '1':
+    from scheduler import Scheduler
+    Scheduler(cache=price_cache).start()
+
+def load_vendor(vendor):
+    # worker scheduler terpisah (python scheduler.py) menulis ke store: pakai snapshot-nya kalau masih segar
     try:
-        # Menggunakan import_module untuk memanggil file .py secara dinamis
-        if vendor == 'antam':
-            module = importlib.import_module('antam')
-            return module.crawl_antam()
-        elif vendor == 'g24':
-            module = importlib.import_module('g24')
-            return module.crawl_g24_only()
-        elif vendor == 'hrta':
-            module = importlib.import_module('hrta')
-            return module.crawl_hartadinata()
-        elif vendor == 'ubs':
-            module = importlib.import_module('ubs')
-            return module.crawl_ubs_complete()
+        # segar selama jadwal scheduler (di luar jam pasar intervalnya jauh lebih panjang dari cache_ttl)
+        snapshot = get_store().snapshot(vendor.id, max_age=vendor.scheduled_ttl())
+    except Exception as e:
+        print(f"[STORE] snapshot {vendor.id} tidak terbaca: {e}")
+        snapshot = None
+    if snapshot:
+        return snapshot
+    data = vendor.crawl()
+    # hasil kosong dianggap gagal supaya tidak di-cache (cache akan pakai data lama kalau ada)
+    if not data:
+        raise RuntimeError(f"crawler {vendor.id} tidak mengembalikan data")
+    return data
+
+def fetch_vendor(vendor):
+    # PRICE_CACHE_TTL (kalau di-set) menimpa TTL bawaan tiap vendor
+    ttl = None if 'PRICE_CACHE_TTL' in os.environ else vendor.cache_ttl
+    return price_cache.get(vendor.id, lambda: load_vendor(vendor), ttl=ttl)
+
+def get_full_data(vendor_id):
+    # Vendor di-resolve lewat registry; modul crawler baru di-import saat dipakai
+    vendor = get_vendor(vendor_id)
+    if vendor is None:
         return []
+    try:
+        return fetch_vendor(vendor)
     except Exception as e:
         # Output error ke log server untuk debugging
-        print(f"Error fetching {vendor}: {str(e)}")
+        print(f"Error fetching {vendor_id}: {str(e)}")
         return []
 
 @app.route('/')
@@ -36,11 +69,168 @@ def index():
 @app.route('/get_price/<vendor>')
 def get_price(vendor):
     data = get_full_data(vendor)
-    # Menambahkan header agar browser tidak menyimpan cache data yang lama
-    response = jsonify(data)
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    # ?format=compact -> format kolom; ETag + no-cache: browser revalidasi dan dapat 304 kalau harga tetap
+    response = json_response(compact_rows(data) if wants_compact() else data)
+    # tandai hasil parsial (mis. UBS tanpa halaman buyback)
+    missing = getattr(data, 'missing', None)
+    if missing:
+        response.headers["X-Partial-Missing"] = ",".join(missing)
+    # halaman vendor belum berubah sejak crawl sebelumnya -> dashboard tidak perlu render ulang
+    unchanged_since = getattr(data, 'unchanged_since', None)
+    if unchanged_since:
+        response.headers["X-Unchanged-Since"] = unchanged_since
     return response
 
+# batas waktu total /get_prices; vendor yang lebih lambat dilaporkan "timeout",
+# crawl-nya tetap jalan di background dan mengisi cache untuk request berikutnya
+BATCH_TIMEOUT = float(os.environ.get('BATCH_TIMEOUT', '25'))
+
+def vendor_payload(res):
+    # tanpa waktu crawl, supaya ETag /get_prices hanya berubah kalau isinya berubah
+    data = res.data or []
+    out = {"status": res.status, "rows": compact_rows(data) if wants_compact() else list(data)}
+    if res.error:
+        out["error"] = res.error
+    if getattr(data, 'missing', None):
+        out["missing"] = data.missing
+    if getattr(data, 'unchanged_since', None):
+        out["unchanged_since"] = data.unchanged_since
+    return out
+
+def number_arg(name, type=float):
+    # ?gram=abc harus 400, bukan diam-diam dianggap tanpa filter seperti request.args.get(type=...)
+    raw = request.args.get(name)
+    if raw is None or raw == '':
+        return None
+    try:
+        return type(raw)
+    except ValueError:
+        raise ValueError(f"parameter {name} harus angka: {raw!r}")
+
+def batch_args():
+    # ?vendors=antam,g24 (default semua) & ?timeout=detik -> (id diminta, Vendor yang dikenal, timeout)
+    requested = request.args.get('vendors')
+    ids = [i.strip() for i in requested.split(',') if i.strip()] if requested else list(VENDORS)
+    timeout = request.args.get('timeout', type=float) or BATCH_TIMEOUT
+    return ids, [get_vendor(i) for i in ids if get_vendor(i) is not None], timeout
+
+@app.route('/get_prices')
+def get_prices():
+    # Semua vendor (atau ?vendors=antam,g24) dalam 1 response, di-crawl paralel lewat cache
+    ids, vendors, timeout = batch_args()
+    results = {i: {"status": "unknown", "rows": []} for i in ids if get_vendor(i) is None}
+    tasks = {v.id: (lambda v=v: fetch_vendor(v)) for v in vendors}
+    for res in iter_crawl(tasks, timeout={v.id: min(v.timeout, timeout) for v in vendors}):
+        results[res.name] = vendor_payload(res)
+        if not res.ok:
+            print(f"Error fetching {res.name}: {res.status} {res.error}")
+
+    return json_response({
+        "vendors": {i: results[i] for i in ids},
+        "partial": any(r["status"] != "ok" for r in results.values()),
+    })
+
+def sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'), default=json_default)}\n\n"
+
+@app.route('/stream_prices')
+def stream_prices():
+    # Server-Sent Events: tiap vendor dikirim begitu crawl-nya selesai (event "vendor"),
+    # lalu event "done". Parameter sama dengan /get_prices.
+    ids, vendors, timeout = batch_args()
+
+    def generate():
+        statuses = {}
+        for i in ids:
+            if get_vendor(i) is None:
+                statuses[i] = "unknown"
+                yield sse("vendor", {"id": i, "status": "unknown", "rows": []})
+        tasks = {v.id: (lambda v=v: fetch_vendor(v)) for v in vendors}
+        for res in iter_crawl(tasks, timeout={v.id: min(v.timeout, timeout) for v in vendors}):
+            statuses[res.name] = res.status
+            if not res.ok:
+                print(f"Error fetching {res.name}: {res.status} {res.error}")
+            yield sse("vendor", {"id": res.name, "elapsed": round(res.elapsed, 3), **vendor_payload(res)})
+        yield sse("done", {"partial": any(st != "ok" for st in statuses.values())})
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    # proxy (nginx) jangan menahan event sampai response selesai
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+@app.route('/history/<vendor>')
+def history(vendor):
+    # Riwayat harga dari price store lokal, tanpa scrape ulang.
+    # Contoh: /history/antam?gram=1&from=2026-01-01&to=2026-01-31
+    if get_vendor(vendor) is None:
+        return jsonify({"error": f"vendor '{vendor}' tidak dikenal"}), 404
+    try:
+        gram = number_arg('gram')
+        limit = number_arg('limit', int)
+        rows = get_store().history(vendor, gram=gram, start=request.args.get('from'),
+                                   end=request.args.get('to'), limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return json_response(compact_rows(rows, export.HISTORY_COLUMNS) if wants_compact() else rows)
+
+@app.route('/best')
+def best():
+    # Perbandingan vendor per gramasi dari index analytics (dihitung saat data masuk store, bukan per request).
+    # Contoh: /best?gram=5  /best?gram=5&date=2026-01-27
+    gram = request.args.get('gram', type=float)
+    if gram is None or gram <= 0:
+        return jsonify({"error": "parameter gram wajib diisi (angka > 0)"}), 400
+    try:
+        payload = analytics.best(gram, request.args.get('date'), get_store())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return json_response(payload)
+
+def export_rows(vendor, gram, start, end):
+    # Tanpa rentang: data terbaru dari cache (atau snapshot terakhir di store); tidak memicu crawl.
+    if start or end or gram is not None:
+        return get_store().iter_history(vendor.id, gram=gram, start=start, end=end)
+    rows = price_cache.peek(vendor.id)
+    return rows if rows else get_store().latest(vendor.id)
+
+@app.route('/export')
+def export_prices():
+    # /export?format=xlsx|csv|parquet&vendors=antam,g24&gram=1&from=2026-01-01&to=2026-01-31
+    fmt = request.args.get('format', 'xlsx')
+    if fmt not in export.FORMATS:
+        return jsonify({"error": f"format '{fmt}' tidak didukung"}), 400
+    ids, vendors, _ = batch_args()
+    try:
+        gram = number_arg('gram')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    start, end = request.args.get('from'), request.args.get('to')
+    history_mode = bool(start or end or gram is not None)
+    columns = export.HISTORY_COLUMNS if history_mode else export.COLUMNS
+    try:
+        sheets = {v.name: export_rows(v, gram, start, end) for v in vendors}
+        body = export.export_stream(fmt, sheets, columns)
+    except (ValueError, RuntimeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    mimetype, ext = export.FORMATS[fmt]
+    filename = f"Harga_Emas_{'Riwayat' if history_mode else 'Terkini'}_{datetime.now().strftime('%Y%m%d')}.{ext}"
+    response = Response(body, mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route('/metrics')
+def metrics_prometheus():
+    # format teks Prometheus: durasi per fase (fetch/render/parse/dedup/export), counter jalur crawl, cache
+    return Response(metrics.registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/metrics')
+def metrics_debug():
+    # versi JSON + span terakhir, untuk dibaca manusia
+    return jsonify(metrics.registry.snapshot())
+
 # Penting untuk Vercel: Objek 'app' harus tersedia di level global
 # Vercel menggunakan WSGI server untuk menjalankan aplikasi ini
 app = app
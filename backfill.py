@@ -0,0 +1,238 @@
+"""
+Import riwayat harga dari arsip ke price store: file Excel hasil antam.main() / prices.main()
+(Harga_Emas_4Vendor_*.xlsx, Harga_Emas_Lengkap_*.xlsx, Harga_<vendor>_*.xlsx) dan halaman vendor
+yang disimpan (*.html, di-parse dengan parser registry vendor).
+
+    python backfill.py arsip/                     # semua .xlsx / .html di bawah arsip/ (rekursif)
+    python backfill.py arsip/ --jobs 8 --dry-run  # hitung saja, tidak menulis store
+    python backfill.py arsip/ --db riwayat.db
+
+File dibaca paralel di process pool (1 file per task); hasilnya di-dedup per (vendor, gram, tanggal)
+lalu ditulis ke store dalam transaksi besar (store.bulk_load). Harga yang sudah ada di store untuk
+tanggal yang sama tidak ditimpa, jadi aman dijalankan ulang.
+"""
+import argparse
+import contextlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import records
+from normalize import clean_currency_many, clean_gram_many
+
+EXTENSIONS = (".xlsx", ".html", ".htm")
+
+# (vendor_id, vendor, gram, tanggal, crawled_at, harga_beli, harga_buyback) -> urutan store.COLUMNS
+Row = Tuple[str, str, float, str, str, int, int]
+
+# label Vendor di Excel -> id registry (Hartadinata punya label per kategori)
+LABEL_PREFIX = (("ANTAM", "antam"), ("GALERI", "g24"), ("HARTADINATA", "hrta"), ("UBS", "ubs"))
+
+# label lama -> label crawl live sekarang (prices.main() lama menulis 'UBS'; file per vendor tanpa
+# kolom Vendor memakai nama sheet), supaya harga yang sama tidak masuk 2x dengan label berbeda
+LEGACY_LABELS = {"UBS": "UBS LIFESTYLE", "GALERI_24": "GALERI 24", "GALERI24": "GALERI 24"}
+
+# kata di nama file halaman tersimpan -> id registry
+FILENAME_HINTS = (("antam", "antam"), ("galeri", "g24"), ("g24", "g24"),
+                  ("hartadinata", "hrta"), ("hrta", "hrta"), ("ubs", "ubs"))
+
+# parser vendor ini memberi tanggal hari ini (halamannya tidak mencantumkan tanggal):
+# untuk halaman arsip diganti tanggal file
+UNDATED_PAGES = {"hrta", "ubs"}
+
+FILE_DATE_RE = re.compile(r"(20\d{2})-?(\d{2})-?(\d{2})")
+
+
+def vendor_id_for(label: str) -> Optional[str]:
+    label = (label or "").upper()
+    for prefix, vid in LABEL_PREFIX:
+        if label.startswith(prefix):
+            return vid
+    return None
+
+
+def current_label(label: str) -> str:
+    label = str(label).strip()
+    return LEGACY_LABELS.get(label.upper(), label)
+
+
+def file_time(path: str) -> datetime:
+    """Waktu crawl arsip: tanggal di nama file (Harga_..._20260127.xlsx), jam dari mtime kalau harinya sama."""
+    mtime = datetime.fromtimestamp(os.path.getmtime(path)).replace(microsecond=0)
+    m = FILE_DATE_RE.search(os.path.basename(path))
+    if not m:
+        return mtime
+    try:
+        day = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return mtime
+    return mtime if mtime.date() == day else datetime(day.year, day.month, day.day)
+
+
+def _iso_date(value, fallback: str) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    s = str(value or "").strip()[:10]
+    return s if re.fullmatch(r"\d{4}-\d{2}-\d{2}", s) else fallback
+
+
+def read_xlsx(path: str, crawled_at: datetime) -> List[Row]:
+    from openpyxl import load_workbook
+
+    fallback = crawled_at.date().isoformat()
+    stamp = crawled_at.isoformat()
+    out: List[Row] = []
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header or "Gramasi" not in header:
+                continue
+            # posisi kolom dari header (file lama hasil pandas bisa punya kolom index tanpa nama)
+            idx = [header.index(c) if c in header else None for c in records.COLUMNS]
+            columns: List[list] = [[] for _ in idx]
+            for r in rows:
+                if not r or all(v is None for v in r):
+                    continue
+                for values, i in zip(columns, idx):
+                    values.append(r[i] if i is not None and i < len(r) else None)
+            vendors, tanggal, grams, beli, buyback = columns
+            # file per vendor bisa tanpa kolom Vendor: pakai nama sheet
+            vendors = [current_label(v or ws.title) for v in vendors]
+            # kolom dinormalisasi sekaligus: arsip berisi gramasi / harga yang sama berulang-ulang
+            for label, tgl, g, b, bb in zip(vendors, tanggal, clean_gram_many(grams).values,
+                                            clean_currency_many(beli).values, clean_currency_many(buyback).values):
+                vid = vendor_id_for(label)
+                if vid and g > 0 and (b or bb):
+                    out.append((vid, label, g, _iso_date(tgl, fallback), stamp, b, bb))
+    finally:
+        wb.close()
+    return out
+
+
+def detect_vendor(path: str, html: str) -> Optional[str]:
+    name = os.path.basename(path).lower()
+    for hint, vid in FILENAME_HINTS:
+        if hint in name:
+            return vid
+    if 'id="GALERI 24"' in html or "id='GALERI 24'" in html:
+        return "g24"
+    if 'data-slot="table"' in html:
+        return "hrta"
+    if "as-producttile" in html or "ubslifestyle" in html:
+        return "ubs"
+    if "antam" in html.lower():
+        return "antam"
+    return None
+
+
+def read_html(path: str, crawled_at: datetime) -> List[Row]:
+    from vendors import get_vendor
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        html = f.read()
+    vid = detect_vendor(path, html)
+    if vid is None:
+        raise ValueError("vendor tidak dikenali")
+    day = crawled_at.date().isoformat()
+    stamp = crawled_at.isoformat()
+    return [(vid, r.vendor, r.gramasi, day if vid in UNDATED_PAGES else r.tanggal, stamp,
+             r.harga_beli, r.harga_buyback)
+            for r in get_vendor(vid).parse(html)]
+
+
+def load_file(path: str) -> Tuple[str, List[Row], Optional[str]]:
+    """Task worker: (path, baris, error). Output print parser dibuang supaya log tidak banjir."""
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            crawled_at = file_time(path)
+            if path.lower().endswith(".xlsx"):
+                return path, read_xlsx(path, crawled_at), None
+            return path, read_html(path, crawled_at), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def find_files(paths: Iterable[str]) -> List[str]:
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, files in os.walk(p):
+                found += [os.path.join(root, f) for f in files if f.lower().endswith(EXTENSIONS)
+                          and not f.startswith("~$")]   # file lock Excel
+        elif p.lower().endswith(EXTENSIONS):
+            found.append(p)
+    return sorted(found)
+
+
+def merge_into(best: Dict[Tuple, Row], rows: Iterable[Row]) -> Dict[Tuple, Row]:
+    """
+    Dedup per (vendor_id, vendor, gram, tanggal): arsip terbaru menang, tapi harga 0 diisi dari arsip lain
+    (halaman katalog & buyback UBS tersimpan terpisah, masing-masing hanya punya satu sisi harga).
+    """
+    for r in rows:
+        key = r[:4]
+        old = best.get(key)
+        if old is None:
+            best[key] = r
+            continue
+        new, other = (r, old) if r[4] >= old[4] else (old, r)
+        best[key] = new[:5] + (new[5] or other[5], new[6] or other[6])
+    return best
+
+
+def backfill(paths: Iterable[str], jobs: Optional[int] = None, store=None, dry_run: bool = False) -> dict:
+    files = find_files(paths)
+    t = time.perf_counter()
+    merged: Dict[Tuple, Row] = {}
+    read, errors = 0, 0
+    if files:
+        jobs = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            # chunksize: banyak file kecil -> lebih sedikit bolak-balik IPC
+            for path, rows, error in pool.map(load_file, files, chunksize=max(1, len(files) // (jobs * 4))):
+                if error:
+                    errors += 1
+                    print(f"[BACKFILL] lewati {path}: {error}")
+                    continue
+                read += len(rows)
+                # merge bertahap supaya memory = jumlah baris unik, bukan semua baris arsip
+                merge_into(merged, rows)
+    parsed_s = time.perf_counter() - t
+
+    inserted = 0
+    if not dry_run and merged:
+        if store is None:
+            from store import get_store
+            store = get_store()
+        inserted = store.bulk_load(sorted(merged.values(), key=lambda r: r[4]))
+    return {"files": len(files), "errors": errors, "rows": read, "unique": len(merged),
+            "inserted": inserted, "parse_s": round(parsed_s, 2), "total_s": round(time.perf_counter() - t, 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="+", help="file / folder arsip (.xlsx, .html)")
+    ap.add_argument("--jobs", type=int, help="jumlah proses (default: jumlah CPU)")
+    ap.add_argument("--db", help="path database (default: PRICE_DB_PATH / harga_emas.db)")
+    ap.add_argument("--dry-run", action="store_true", help="baca & dedup saja, tidak menulis store")
+    args = ap.parse_args()
+
+    store = None
+    if args.db and not args.dry_run:
+        from store import PriceStore
+        store = PriceStore(args.db)
+    stats = backfill(args.paths, args.jobs, store, args.dry_run)
+    print(f"[BACKFILL] {stats['files']} file ({stats['errors']} gagal), {stats['rows']:,} baris, "
+          f"{stats['unique']:,} unik, {stats['inserted']:,} baru di store "
+          f"(baca {stats['parse_s']} dtk, total {stats['total_s']} dtk)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark fallback regex ANTAM: versi lama (1 regex per kandidat gramasi, masing-masing
+scan seluruh teks) vs versi single-pass di antam.antam_parse_fallback_regex.
+
+    python bench/antam_regex.py                      # halaman sintetis 1k / 10k / 50k baris
+    python bench/antam_regex.py --html page1.html    # + halaman tersimpan
+
+Yang diukur hanya tahap teks -> baris (soup sudah di-parse sekali sebelum timing).
+Sebelumnya CASES dicek dulu (exit 1 kalau hasil single-pass tidak sesuai).
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import antam  # noqa: E402
+import normalize  # noqa: E402
+from parsing import make_soup  # noqa: E402
+
+LEGACY_CANDIDATES = [0.5, 1, 2, 3, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+# teks baris -> {gramasi: harga} yang diharapkan dari antam_parse_fallback_regex
+CASES = [
+    ("0,5 gr Rp 779.444", {0.5: 779444}),
+    ("1 gr Rp 1.420.000 2 gr Rp 2.790.000", {1.0: 1420000, 2.0: 2790000}),
+    # angka ribuan bukan gramasi
+    ("Harga 1.420.000 Rp 1.420.000", {}),
+    # persen pajak di halaman ANTAM bukan gramasi
+    ("Harga + PPh 0.25% Rp 779.444", {}),
+    ("Harga + PPh 0.25 % Rp 779.444", {}),
+    ("PPh 0.25% 0,5 gr Rp 779.444", {0.5: 779444}),
+]
+
+
+def check_cases() -> int:
+    failed = 0
+    for text, expected in CASES:
+        got = {r.gramasi: r.harga_beli for r in antam.antam_parse_fallback_regex(f"<p>{text}</p>")}
+        if got != expected:
+            failed += 1
+            print(f"GAGAL {text!r}: {got}, harusnya {expected}")
+    print(f"kasus: {len(CASES) - failed}/{len(CASES)} cocok\n")
+    return failed
+
+
+def legacy_fallback(soup):
+    """Salinan implementasi lama (sebelum single-pass) sebagai pembanding."""
+    text = soup.get_text(" ", strip=True)
+    tanggal = normalize.parse_tanggal_update(text)
+    out = []
+    for g in LEGACY_CANDIDATES:
+        g_str_dot = str(g).replace(".0", "")
+        g_str_comma = g_str_dot.replace(".", ",")
+        pat = re.compile(rf"(?<!\d)({re.escape(g_str_dot)}|{re.escape(g_str_comma)})(?!\d).{{0,80}}?(Rp\.?\s*[0-9][0-9\.\,]*)", re.IGNORECASE)
+        m = pat.search(text)
+        if m:
+            gram = normalize.clean_gram(m.group(1))
+            price = normalize.clean_currency(m.group(2))
+            if gram > 0 and price > 0:
+                out.append({"Vendor": "ANTAM", "Tanggal": tanggal, "Gramasi": gram,
+                            "Harga Beli": price, "Harga Buyback": 0})
+    dedup = {r["Gramasi"]: r for r in out}
+    return [dedup[g] for g in sorted(dedup.keys())]
+
+
+def synthetic_page(rows: int, seed: int = 1, big_bars: bool = True) -> str:
+    """
+    Halaman tanpa <table>: blok teks gramasi + harga diselingi noise (artikel, tanggal, angka lain).
+    big_bars=False: tanpa 250/500/1000 gr -> kandidat yang tidak ada memaksa versi lama scan seluruh teks.
+    """
+    rnd = random.Random(seed)
+    parts = ["<html><body><h1>Harga Emas Antam Hari Ini</h1><p>Diperbarui Selasa, 27 Januari 2026</p>"]
+    for i in range(rows):
+        if i % 7 == 0:
+            parts.append(f"<p>Artikel {i}: investasi emas naik {rnd.randint(1, 99)} persen sejak {rnd.randint(2000, 2025)}.</p>")
+        # gramasi besar di akhir supaya versi lama harus scan jauh untuk menemukannya
+        if big_bars and i >= rows - 3:
+            gram = [250, 500, 1000][i - rows + 3]
+        else:
+            gram = rnd.choice([0.5, 1, 2, 3, 5, 10, 25, 50, 100])
+        price = int(gram * 1_420_000) + rnd.randint(0, 999) * 1000
+        g_txt = str(gram).replace(".0", "").replace(".", ",")
+        parts.append(f"<div class='row'><span>{g_txt} gr</span> <span>Rp {price:,}</span></div>".replace(",", "."))
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def bench(fn, soup, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(soup)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--html", nargs="*", default=[], help="file HTML tersimpan")
+    ap.add_argument("--rows", nargs="*", type=int, default=[1_000, 10_000, 50_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if check_cases():
+        sys.exit(1)
+
+    pages = [(f"sintetis {n} baris", synthetic_page(n)) for n in args.rows]
+    pages += [(f"sintetis {n} tanpa >=250g", synthetic_page(n, big_bars=False)) for n in args.rows]
+    # worst case: tidak ada nominal Rp sama sekali -> semua kandidat versi lama gagal & scan seluruh teks
+    pages += [(f"sintetis {n} tanpa Rp", synthetic_page(n).replace("Rp", "IDR")) for n in args.rows]
+    for path in args.html:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(path), f.read()))
+
+    print(f"{'halaman':<30}{'teks':>10}{'lama':>12}{'single-pass':>14}{'speedup':>9}{'baris lama/baru':>18}")
+    for label, html in pages:
+        soup = make_soup(html)
+        text_len = len(soup.get_text(" ", strip=True))
+        t_old = bench(legacy_fallback, soup, args.repeat)
+        t_new = bench(antam.antam_parse_fallback_regex, soup, args.repeat)
+        n_old = len(legacy_fallback(soup))
+        n_new = len(antam.antam_parse_fallback_regex(soup))
+        print(f"{label:<30}{text_len:>10,}{t_old * 1000:>10.1f}ms{t_new * 1000:>12.1f}ms"
+              f"{t_old / t_new:>8.1f}x{n_old:>10}/{n_new}")
+
+
+if __name__ == "__main__":
+    main()
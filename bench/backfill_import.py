@@ -0,0 +1,105 @@
+"""
+Benchmark backfill.py: arsip sintetis (1 Excel 4 vendor + halaman tersimpan per hari) diimpor ke
+store sementara dengan beberapa jumlah proses.
+
+    python bench/backfill_import.py                  # 60 hari, --jobs 1 dan jumlah CPU
+    python bench/backfill_import.py --days 365 --jobs 1 2 4 8
+    python bench/backfill_import.py --no-html        # Excel saja
+
+Harga tiap hari digeser sedikit supaya baris antar hari tidak identik; halaman HTML memakai
+snapshot bench/fixtures (tanggal diambil dari nama file untuk vendor tanpa tanggal di halaman).
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import backfill  # noqa: E402
+import fixtures  # noqa: E402
+from export import write_xlsx  # noqa: E402
+from records import PriceRow  # noqa: E402
+from store import PriceStore  # noqa: E402
+from vendors import VENDORS  # noqa: E402
+
+# halaman tersimpan: nama file -> snapshot
+PAGES = {"antam": "antam.html", "g24": "g24.html", "hrta": "hrta.html",
+         "ubs_catalog": "ubs_catalog.html", "ubs_buyback": "ubs_buyback.html"}
+
+
+def base_rows() -> dict:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rows = {vid: VENDORS[vid].parse(fixtures.load(PAGES["ubs_catalog" if vid == "ubs" else vid]))
+                for vid in VENDORS}
+    return rows
+
+
+def make_archive(root: str, days: int, html: bool) -> int:
+    """Tulis arsip ke root; return jumlah file."""
+    base = base_rows()
+    start = date(2025, 1, 1)
+    for d in range(days):
+        day = start + timedelta(days=d)
+        stamp = day.strftime("%Y%m%d")
+        shift = 1 + (d % 50) / 1000
+        sheets = {
+            name: [PriceRow(r.vendor, day.isoformat(), r.gramasi, int(r.harga_beli * shift), int(r.harga_buyback * shift))
+                   for r in base[vid]]
+            for vid, name in (("antam", "ANTAM"), ("g24", "GALERI24"), ("hrta", "HARTADINATA"), ("ubs", "UBS"))
+        }
+        sheets = {"ALL": [r for rows in sheets.values() for r in rows], **sheets}
+        with open(os.path.join(root, f"Harga_Emas_4Vendor_{stamp}.xlsx"), "wb") as f:
+            write_xlsx(sheets, f)
+        if html:
+            os.makedirs(os.path.join(root, "pages"), exist_ok=True)
+            for name, snapshot in PAGES.items():
+                shutil.copyfile(os.path.join(fixtures.FIXTURE_DIR, snapshot),
+                                os.path.join(root, "pages", f"{name}_{stamp}.html"))
+    return days * (1 + (len(PAGES) if html else 0))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--days", type=int, default=60)
+    ap.add_argument("--jobs", nargs="*", type=int, default=sorted({1, os.cpu_count() or 1}))
+    ap.add_argument("--no-html", action="store_true", help="tanpa halaman HTML tersimpan")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="harga_emas_backfill_")
+    try:
+        archive = os.path.join(tmp, "arsip")
+        os.makedirs(archive)
+        t = time.perf_counter()
+        n_files = make_archive(archive, args.days, not args.no_html)
+        print(f"arsip: {n_files} file ({args.days} hari) dibuat dalam {time.perf_counter() - t:.1f} dtk, "
+              f"CPU: {os.cpu_count()}\n")
+
+        print(f"{'jobs':>5}{'baris':>10}{'unik':>9}{'baru':>9}{'baca':>9}{'total':>9}{'file/s':>9}{'baris/s':>10}")
+        for jobs in args.jobs:
+            store = PriceStore(os.path.join(tmp, f"jobs{jobs}.db"))
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                s = backfill.backfill([archive], jobs=jobs, store=store)
+            print(f"{jobs:>5}{s['rows']:>10,}{s['unique']:>9,}{s['inserted']:>9,}{s['parse_s']:>8.1f}s"
+                  f"{s['total_s']:>8.1f}s{s['files'] / s['total_s']:>9.1f}{s['rows'] / s['total_s']:>10,.0f}")
+            if s["errors"]:
+                print(f"      {s['errors']} file gagal dibaca")
+            # store kosong: tiap baris unik hasil dedup harus masuk (key store = key dedup)
+            if s["inserted"] != s["unique"]:
+                raise SystemExit(f"      store kosong hanya menerima {s['inserted']} dari {s['unique']} baris unik")
+            # import ulang: semua baris sudah ada -> tidak ada baris baru
+            again = backfill.backfill([archive], jobs=jobs, store=store)["inserted"] if jobs == args.jobs[0] else 0
+            if again:
+                print(f"      import ulang menambah {again} baris (harusnya 0)")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
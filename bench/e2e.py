@@ -0,0 +1,133 @@
+"""
+Benchmark jalur penuh fetch -> parse -> JSON lewat Flask app, tanpa jaringan:
+URL vendor diarahkan ke bench/stub_server.py (snapshot bench/fixtures).
+
+    python bench/e2e.py                    # 10 request per skenario
+    python bench/e2e.py --latency 80       # tiru RTT server vendor (ms per request)
+    python bench/e2e.py --rows 5000        # halaman besar (varian sintetis)
+
+Skenario /get_prices:
+- cold      : cache + state ETag/fingerprint dikosongkan -> fetch + parse penuh
+- unchanged : cache dikosongkan, halaman tidak berubah -> 304 / fingerprint sama, parse dilewati
+- cached    : langsung dari price_cache
+
+Hartadinata memakai mode endpoint JSON (spec dipelajari dari hrta.json), jadi tidak ada
+browser yang dijalankan; fallback Playwright tidak ikut diukur.
+"""
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+# store & endpoint Hartadinata di direktori sementara, jangan menimpa milik app
+TMP = tempfile.mkdtemp(prefix="harga_emas_bench_")
+os.environ["PRICE_DB_PATH"] = os.path.join(TMP, "bench.db")
+os.environ["HRTA_ENDPOINT_FILE"] = os.path.join(TMP, "hrta_endpoint.json")
+os.environ.pop("PRICE_SCHEDULER", None)
+
+import antam  # noqa: E402
+import app as webapp  # noqa: E402
+import changes  # noqa: E402
+import fixtures  # noqa: E402
+import g24  # noqa: E402
+import hrta  # noqa: E402
+import metrics  # noqa: E402
+import ubs  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+DEVNULL = open(os.devnull, "w")
+
+
+def quiet():
+    # crawler mencetak progres per langkah; dibuang supaya terminal tidak ikut diukur
+    return contextlib.redirect_stdout(DEVNULL)
+
+
+def point_vendors_at(server: StubServer) -> None:
+    antam.URL = server.url("/antam")
+    g24.URL = server.url("/g24")
+    ubs.URL_CATALOG = server.url("/ubs/catalog")
+    ubs.URL_BUYBACK = server.url("/ubs/buyback")
+    hrta.ENDPOINT_HOSTS = ("127.0.0.1",)   # spec endpoint hanya diterima untuk host stub
+
+    # spec endpoint dipelajari seperti setelah 1x render di browser: tabel hrta.html + XHR hrta.json
+    captured = [{"url": server.url("/hrta.json"), "method": "GET", "post_data": None,
+                 "json": json.loads(fixtures.load("hrta.json"))}]
+    spec = hrta.learn_endpoint(captured, hrta.parse_table(fixtures.load("hrta.html")))
+    if not spec:
+        raise SystemExit("endpoint Hartadinata tidak bisa dipelajari dari hrta.json")
+    with quiet():
+        hrta.save_endpoint(spec)
+
+
+def large_pages(rows: int) -> dict:
+    per_cat = max(1, rows // len(fixtures.HRTA_CATEGORIES))
+    return {
+        "/antam": fixtures.antam_page(rows),
+        "/g24": fixtures.g24_page(rows),
+        "/hrta.json": json.dumps(fixtures.hrta_data(per_cat)),
+        "/ubs/catalog": fixtures.ubs_catalog_page(rows),
+        "/ubs/buyback": fixtures.ubs_buyback_page(rows),
+    }
+
+
+SCENARIOS = {
+    "cold": lambda: (webapp.price_cache.invalidate(), changes.tracker.forget()),
+    "unchanged": lambda: webapp.price_cache.invalidate(),
+    "cached": lambda: None,
+}
+
+
+def run(client, scenario: str, n: int) -> dict:
+    times, size, vendors = [], 0, {}
+    metrics.registry.reset()
+    for _ in range(n):
+        SCENARIOS[scenario]()
+        t = time.perf_counter()
+        with quiet():
+            resp = client.get("/get_prices", headers={"Accept-Encoding": "gzip"})
+        times.append(time.perf_counter() - t)
+        size = len(resp.data)
+    body = gzip.decompress(resp.data) if resp.headers.get("Content-Encoding") == "gzip" else resp.data
+    vendors = {k: (v["status"], len(v["rows"])) for k, v in json.loads(body)["vendors"].items()}
+    return {"times": times, "size": size, "vendors": vendors, "metrics": metrics.registry.snapshot()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=10, help="request per skenario")
+    ap.add_argument("--latency", type=float, default=0.0, help="jeda stub server per request (ms)")
+    ap.add_argument("--rows", type=int, help="pakai varian sintetis dengan N baris per vendor")
+    args = ap.parse_args()
+
+    with StubServer(latency=args.latency / 1000, pages=large_pages(args.rows) if args.rows else None) as server:
+        point_vendors_at(server)
+        client = webapp.app.test_client()
+        with quiet():
+            client.get("/get_prices")   # pemanasan: import crawler, koneksi keep-alive
+
+        for scenario in SCENARIOS:
+            hits = server.hits
+            res = run(client, scenario, args.n)
+            t = sorted(res["times"])
+            print(f"\n== {scenario}: median {statistics.median(t) * 1000:.1f} ms, "
+                  f"p90 {t[min(len(t) - 1, int(len(t) * 0.9))] * 1000:.1f} ms, body {res['size'] / 1024:.1f} KB (gzip), "
+                  f"{(server.hits - hits) / args.n:.0f} request ke stub per /get_prices")
+            print("   vendor: " + ", ".join(f"{k}={s}/{n}" for k, (s, n) in res["vendors"].items()))
+            for sp in res["metrics"]["spans"]:
+                print(f"   {sp['vendor']:<8}{sp['phase']:<10}{sp['count']:>5}x  avg {sp['avg_ms']:>8.2f} ms"
+                      f"  max {sp['max_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
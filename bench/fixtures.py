@@ -0,0 +1,160 @@
+"""
+Halaman vendor untuk benchmark offline (tanpa jaringan).
+
+bench/fixtures/ berisi snapshot ukuran normal: antam.html, g24.html, hrta.html, hrta.json,
+ubs_catalog.html, ubs_buyback.html. Markup-nya mengikuti struktur yang dibaca parser
+(tabel ANTAM, div#GALERI 24 + grid-cols-5, table[data-slot] Hartadinata, tile & tabel UBS)
+plus "noise" halaman (nav, artikel, script) supaya ukuran dokumen mendekati aslinya.
+Snapshot boleh ditimpa dengan halaman asli yang disimpan dari browser (nama file sama).
+
+Varian besar (ribuan baris) dibuat saat benchmark jalan, tidak disimpan:
+
+    python bench/fixtures.py            # tulis ulang snapshot ukuran normal
+"""
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ANTAM_GRAMS = [0.5, 1, 2, 3, 5, 10, 25, 50, 100, 250, 500, 1000]
+G24_GRAMS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+HRTA_GRAMS = [0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 25, 50, 100]
+HRTA_CATEGORIES = ["EMAS BATANGAN", "EMAS BATANGAN GIFT SERIES", "EMAS BATANGAN IMLEK"]
+UBS_GRAMS = [0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 25, 50, 100, 250, 500]
+
+PRICE_PER_GRAM = 1_555_000
+
+
+def rupiah(n: int) -> str:
+    return f"Rp{n:,}".replace(",", ".")
+
+
+def gram_txt(g: float, comma: bool = False) -> str:
+    s = f"{g:g}"
+    return s.replace(".", ",") if comma else s
+
+
+def gram_series(rows: int, base: list) -> list:
+    """Daftar gramasi unik sepanjang `rows`: pakai daftar asli dulu, lalu kelipatan 0.01 g."""
+    out = list(base[:rows])
+    i = 1
+    while len(out) < rows:
+        g = round(base[-1] + i * 0.01, 2)
+        out.append(g)
+        i += 1
+    return out
+
+
+def noise(rnd: random.Random, blocks: int) -> str:
+    """Isi halaman yang tidak dipakai parser: menu, artikel, script analytics."""
+    parts = ["<nav><ul>" + "".join(f"<li><a href='/kategori/{i}'>Menu {i}</a></li>" for i in range(30)) + "</ul></nav>"]
+    for i in range(blocks):
+        parts.append(f"<article><h2>Berita emas {i}</h2><p>Harga emas dunia bergerak {rnd.randint(1, 99)} poin "
+                     f"pada perdagangan {rnd.randint(1, 28)} Desember {rnd.randint(2015, 2025)}. "
+                     + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6 + "</p></article>")
+    parts.append("<script>window.__STATE__=" + json.dumps({"k": [rnd.random() for _ in range(blocks * 20)]}) + "</script>")
+    return "".join(parts)
+
+
+def antam_page(rows: int = len(ANTAM_GRAMS), noise_blocks: int = 40, seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    trs = "".join(
+        f"<tr><td>{gram_txt(g)} gr</td><td>{rupiah(int(g * PRICE_PER_GRAM))}</td>"
+        f"<td>{rupiah(int(g * PRICE_PER_GRAM * 1.0025))}</td></tr>"
+        for g in gram_series(rows, ANTAM_GRAMS))
+    return (f"<html><head><title>Harga Emas Antam Hari Ini</title></head><body>{noise(rnd, noise_blocks // 2)}"
+            f"<h1>Harga Emas Antam Hari Ini</h1><p>Diperbarui Selasa, 27 Januari 2026</p>"
+            f"<table class='tabel-harga'><tr><th>Berat</th><th>Harga Dasar</th><th>Harga (+Pajak PPh 0.25%)</th></tr>{trs}</table>"
+            f"{noise(rnd, noise_blocks // 2)}</body></html>")
+
+
+def _g24_grid(brand: str, grams: list) -> str:
+    head = ("<div class='grid grid-cols-5 divide-x font-bold'><div>Berat</div><div>Harga Jual</div>"
+            "<div>Harga Buyback</div><div></div><div></div></div>")
+    rows = "".join(
+        f"<div class='grid grid-cols-5 divide-x lg:divide-x-0'><div class='p-3'>{gram_txt(g)}</div>"
+        f"<div class='p-3'>{rupiah(int(g * PRICE_PER_GRAM))}</div><div class='p-3'>{rupiah(int(g * PRICE_PER_GRAM * 0.9))}</div>"
+        f"<div></div><div></div></div>" for g in grams)
+    return (f"<div id='{brand}' class='tab-content'><div class='text-lg font-semibold mb-4'>"
+            f"Diperbarui Selasa, 27 Januari 2026</div>{head}{rows}</div>")
+
+
+def g24_page(rows: int = len(G24_GRAMS), noise_blocks: int = 40, seed: int = 2) -> str:
+    rnd = random.Random(seed)
+    # halaman asli punya 1 tab per merek; parser hanya membaca GALERI 24
+    tabs = "".join(_g24_grid(b, G24_GRAMS) for b in ("ANTAM", "UBS", "LOTUS ARCHI"))
+    return (f"<html><body>{noise(rnd, noise_blocks // 2)}{tabs}"
+            f"{_g24_grid('GALERI 24', gram_series(rows, G24_GRAMS))}{noise(rnd, noise_blocks // 2)}</body></html>")
+
+
+def hrta_data(rows_per_category: int = len(HRTA_GRAMS)) -> dict:
+    """Bentuk response JSON yang diambil tabel Hartadinata (untuk mode endpoint)."""
+    return {"status": "success", "data": [
+        {"category": cat, "items": [
+            {"weight": gram_txt(g), "price": int(g * 1_680_000) + ci * 1000, "buyback": int(g * 1_500_000)}
+            for g in gram_series(rows_per_category, HRTA_GRAMS)]}
+        for ci, cat in enumerate(HRTA_CATEGORIES)]}
+
+
+def hrta_page(rows_per_category: int = len(HRTA_GRAMS), noise_blocks: int = 30, seed: int = 3) -> str:
+    rnd = random.Random(seed)
+    cell = "td data-slot='table-cell' class='p-2 align-middle'"
+    body = []
+    for group in hrta_data(rows_per_category)["data"]:
+        body.append(f"<tr data-slot='table-row'><{cell} colspan='3'>{group['category']}</td></tr>")
+        for it in group["items"]:
+            body.append(f"<tr data-slot='table-row'><{cell}>{it['weight']} gr</td><{cell}>{rupiah(it['price'])}</td>"
+                        f"<{cell}>{rupiah(it['buyback'])}</td></tr>")
+    table = (f"<table data-slot='table'><thead data-slot='table-header'><tr data-slot='table-row'><th>Gram</th>"
+             f"<th>Harga Dasar</th><th>Buyback</th></tr></thead><tbody data-slot='table-body'>{''.join(body)}</tbody></table>")
+    return f"<html><body><div id='__next'>{noise(rnd, noise_blocks // 2)}{table}{noise(rnd, noise_blocks // 2)}</div></body></html>"
+
+
+def ubs_catalog_page(tiles: int = len(UBS_GRAMS), noise_blocks: int = 30, seed: int = 4) -> str:
+    rnd = random.Random(seed)
+    cards = "".join(
+        f"<div class='as-producttile col-6 col-md-3'><a href='/p/{i}'><img src='/img/{i}.jpg'></a>"
+        f"<h3 class='as-producttile-name'>Logam Mulia UBS Classic {gram_txt(g, comma=True)} Gram</h3>"
+        f"<span class='woocommerce-Price-amount amount'><bdi>{rupiah(int(g * 1_724_700))}</bdi></span></div>"
+        for i, g in enumerate(gram_series(tiles, UBS_GRAMS)))
+    return f"<html><body>{noise(rnd, noise_blocks // 2)}<div class='products row'>{cards}</div>{noise(rnd, noise_blocks // 2)}</body></html>"
+
+
+def ubs_buyback_page(rows: int = len(UBS_GRAMS), noise_blocks: int = 30, seed: int = 5) -> str:
+    rnd = random.Random(seed)
+    trs = "".join(
+        f"<tr><td>{gram_txt(g, comma=True)} Gram</td><td>{rupiah(int(g * 1_724_700))}</td>"
+        f"<td>{rupiah(int(g * 1_560_000))}</td></tr>" for g in gram_series(rows, UBS_GRAMS))
+    return (f"<html><body>{noise(rnd, noise_blocks // 2)}<table class='table-price'><thead><tr><th>Gramasi</th>"
+            f"<th>Harga Beli</th><th>Harga Buyback</th></tr></thead><tbody>{trs}</tbody></table>"
+            f"{noise(rnd, noise_blocks // 2)}</body></html>")
+
+
+SNAPSHOTS = {
+    "antam.html": antam_page,
+    "g24.html": g24_page,
+    "hrta.html": hrta_page,
+    "ubs_catalog.html": ubs_catalog_page,
+    "ubs_buyback.html": ubs_buyback_page,
+}
+
+
+def load(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, make in SNAPSHOTS.items():
+        with open(os.path.join(FIXTURE_DIR, name), "w", encoding="utf-8") as f:
+            f.write(make())
+    with open(os.path.join(FIXTURE_DIR, "hrta.json"), "w", encoding="utf-8") as f:
+        json.dump(hrta_data(), f, indent=1)
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        print(f"{name:<20}{os.path.getsize(os.path.join(FIXTURE_DIR, name)):>10,} byte")
+
+
+if __name__ == "__main__":
+    main()
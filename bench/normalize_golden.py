@@ -0,0 +1,153 @@
+"""
+Cek corpus golden normalize.py lalu bandingkan kecepatannya dengan salinan lama per vendor.
+
+    python bench/normalize_golden.py                 # cek golden + benchmark 100k string
+    python bench/normalize_golden.py --check         # cek golden saja (exit 1 kalau ada yang beda)
+    python bench/normalize_golden.py -n 1000000
+
+bench/golden/normalize.json: {"fungsi": [[input, expected], ...]}; "TODAY" = tanggal hari ini.
+Fungsi yang punya versi kolom (clean_*_many) juga dicek: hasilnya harus sama dengan versi per sel.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import normalize  # noqa: E402
+
+GOLDEN = os.path.join(HERE, "golden", "normalize.json")
+
+
+def check_golden() -> int:
+    with open(GOLDEN, encoding="utf-8") as f:
+        corpus = json.load(f)
+    failed = 0
+    for name, cases in corpus.items():
+        fn = getattr(normalize, name)
+        for raw, expected in cases:
+            if expected == "TODAY":
+                expected = normalize.today_iso()
+            got = fn(raw)
+            if got != expected or type(got) is not type(expected):
+                failed += 1
+                print(f"GAGAL {name}({raw!r}) = {got!r}, harusnya {expected!r}")
+        # versi batch (jalur pandas: kolom >= BATCH_MIN) harus sama persis dengan versi per sel
+        batch = getattr(normalize, name + "_many", None)
+        if batch:
+            reps = normalize.BATCH_MIN // len(cases) + 1
+            raws = [raw for raw, _ in cases] * reps
+            got = batch(raws).values
+            want = [fn(raw) for raw in raws]
+            if got != want:
+                failed += 1
+                print(f"GAGAL {name}_many berbeda dari {name} per sel")
+            failed += check_arrow(name, fn, batch, [raw for raw in raws if isinstance(raw, str)])
+    total = sum(len(c) for c in corpus.values())
+    print(f"golden: {total - failed}/{total} cocok (+ versi batch)")
+    return failed
+
+
+def check_arrow(name: str, fn, batch, raws: list) -> int:
+    """Kolom Arrow (string) harus memberi hasil yang sama dengan list Python; dilewati tanpa pyarrow."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return 0
+    failed = 0
+    for label, column in (("Array", pa.array(raws)), ("ChunkedArray", pa.chunked_array([raws[:7], raws[7:]]))):
+        if batch(column).values != [fn(raw) for raw in raws]:
+            failed += 1
+            print(f"GAGAL {name}_many(pyarrow.{label}) berbeda dari {name} per sel")
+    return failed
+
+
+# salinan implementasi lama (g24 / ubs / hrta: re.sub per panggilan) sebagai pembanding
+def legacy_clean_currency(price_str):
+    if not price_str:
+        return 0
+    digits = re.sub(r"[^\d]", "", str(price_str))
+    return int(digits) if digits else 0
+
+
+def legacy_clean_gram(gram_str):
+    if not gram_str:
+        return 0.0
+    s = re.sub(r"[^\d\.,]", "", str(gram_str)).replace(",", ".")
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+
+def corpus(n: int, seed: int = 7) -> tuple:
+    """Campuran bentuk yang muncul di halaman vendor: 'Rp1.555.000', 'Rp 1.420.000,00', angka bersih."""
+    rnd = random.Random(seed)
+    prices, grams = [], []
+    for _ in range(n):
+        p = rnd.randint(50_000, 1_600_000_000)
+        dotted = f"{p:,}".replace(",", ".")
+        prices.append(rnd.choice([f"Rp{dotted}", f"Rp {dotted}", f"Rp {dotted},00", str(p)]))
+        g = rnd.choice([0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000])
+        grams.append(rnd.choice([f"{g:g}", f"{g:g} gr", f"{g:g}".replace(".", ",") + " Gram"]))
+    return prices, grams
+
+
+def bench(fn, items) -> float:
+    best = float("inf")
+    for _ in range(3):
+        t = time.perf_counter()
+        for s in items:
+            fn(s)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=100_000)
+    ap.add_argument("--check", action="store_true", help="cek golden saja")
+    args = ap.parse_args()
+
+    failed = check_golden()
+    if failed or args.check:
+        sys.exit(1 if failed else 0)
+
+    prices, grams = corpus(args.n)
+    clean = [s for s in prices if s.isdigit()]
+    print(f"\n{'fungsi':<16}{'input':<22}{'lama':>10}{'baru':>10}{'speedup':>9}")
+    for name, legacy, new, items in [
+        ("clean_currency", legacy_clean_currency, normalize.clean_currency, prices),
+        ("clean_currency", legacy_clean_currency, normalize.clean_currency, clean),
+        ("clean_gram", legacy_clean_gram, normalize.clean_gram, grams),
+    ]:
+        label = f"{len(items):,} {'angka bersih' if items is clean else 'campuran'}"
+        t_old, t_new = bench(legacy, items), bench(new, items)
+        print(f"{name:<16}{label:<22}{t_old * 1000:>8.1f}ms{t_new * 1000:>8.1f}ms{t_old / t_new:>8.1f}x")
+
+    # batch per kolom: arsip snapshot berisi harga / gramasi yang sama berulang-ulang
+    rnd = random.Random(11)
+    repeated = [rnd.choice(prices[:2000]) for _ in range(len(prices))]
+    print(f"\n{'batch':<16}{'input':<26}{'per sel':>10}{'_many':>10}{'speedup':>9}")
+    for name, one, many, items, label in [
+        ("clean_currency", normalize.clean_currency, normalize.clean_currency_many, prices, "unik"),
+        ("clean_currency", normalize.clean_currency, normalize.clean_currency_many, repeated, "2k nilai berulang"),
+        ("clean_gram", normalize.clean_gram, normalize.clean_gram_many, grams, "berulang"),
+    ]:
+        many(items[:normalize.BATCH_MIN])   # import pandas tidak ikut diukur
+        t_one = bench(lambda xs: [one(x) for x in xs], [items])
+        t_many = bench(many, [items])
+        print(f"{name:<16}{f'{len(items):,} {label}':<26}{t_one * 1000:>8.1f}ms{t_many * 1000:>8.1f}ms{t_one / t_many:>8.1f}x")
+
+    # salinan lama membaca ",00" sebagai digit: harga 100x lipat
+    wrong = sum(legacy_clean_currency(s) != normalize.clean_currency(s) for s in prices)
+    print(f"\nnilai berbeda dari versi lama: {wrong:,} dari {len(prices):,} (bentuk 'Rp ...,00')")
+
+
+if __name__ == "__main__":
+    main()
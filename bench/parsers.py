@@ -0,0 +1,92 @@
+"""
+Benchmark parser per vendor: waktu, throughput (baris/detik, MB/detik) dan peak memory (tracemalloc).
+
+    python bench/parsers.py                        # snapshot bench/fixtures + varian besar 2k / 10k baris
+    python bench/parsers.py --rows 1000 50000      # ukuran varian besar lain
+    python bench/parsers.py --backend html.parser  # bandingkan backend parser (default: parsing.PARSER)
+    python bench/parsers.py --only g24 ubs         # sebagian parser saja
+
+Waktu = terbaik dari --repeat kali; peak memory diukur di run terpisah (tracemalloc memperlambat).
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import antam  # noqa: E402
+import fixtures  # noqa: E402
+import g24  # noqa: E402
+import hrta  # noqa: E402
+import parsing  # noqa: E402
+import ubs  # noqa: E402
+from antam_regex import synthetic_page  # noqa: E402
+
+# nama -> (fungsi parse(html) -> baris, snapshot, pembuat varian besar(rows))
+PARSERS = {
+    "antam_table": (antam.antam_parse_table, "antam.html", fixtures.antam_page),
+    "antam_regex": (antam.antam_parse_fallback_regex, "antam.html", synthetic_page),
+    "g24": (g24.parse_g24, "g24.html", fixtures.g24_page),
+    "hrta": (hrta.parse_table, "hrta.html", lambda n: fixtures.hrta_page(max(1, n // len(fixtures.HRTA_CATEGORIES)))),
+    "ubs_catalog": (ubs.parse_catalog, "ubs_catalog.html", fixtures.ubs_catalog_page),
+    "ubs_buyback": (ubs.parse_buyback, "ubs_buyback.html", fixtures.ubs_buyback_page),
+}
+
+
+def run_quiet(fn, html):
+    # parse_catalog mencetak 1 baris per tile; output dibuang supaya terminal tidak ikut diukur
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return fn(html)
+
+
+def best_time(fn, html, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        run_quiet(fn, html)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def peak_memory(fn, html) -> int:
+    tracemalloc.start()
+    try:
+        run_quiet(fn, html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", nargs="*", type=int, default=[2_000, 10_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--backend", choices=["lxml", "html.parser", "html5lib"], help="backend BeautifulSoup")
+    ap.add_argument("--only", nargs="*", choices=sorted(PARSERS))
+    args = ap.parse_args()
+
+    if args.backend:
+        parsing.PARSER = args.backend
+    print(f"backend: {parsing.PARSER}\n")
+    print(f"{'parser':<13}{'halaman':<18}{'KB':>8}{'baris':>8}{'waktu':>11}{'baris/s':>12}{'MB/s':>8}{'peak MB':>9}")
+
+    for name in args.only or PARSERS:
+        fn, snapshot, make_large = PARSERS[name]
+        pages = [(snapshot, fixtures.load(snapshot))]
+        pages += [(f"sintetis {n:,}", make_large(n)) for n in args.rows]
+        for label, html in pages:
+            rows = run_quiet(fn, html)
+            t = best_time(fn, html, args.repeat)
+            peak = peak_memory(fn, html)
+            size = len(html.encode("utf-8"))
+            print(f"{name:<13}{label:<18}{size / 1024:>8.0f}{len(rows):>8,}{t * 1000:>9.1f}ms"
+                  f"{len(rows) / t:>12,.0f}{size / t / 1e6:>8.1f}{peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark cold start jalur web (Vercel): waktu import + RSS proses setelah import.
+
+    python bench/startup.py                 # tree saat ini
+    python bench/startup.py --ref HEAD~1    # bandingkan dengan commit lain (before/after)
+
+Tiap skenario dijalankan di proses python baru (cold), diulang --repeat kali, dilaporkan median.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    # cold start function: hanya import app
+    "import app": "import app",
+    # request pertama: app + semua modul crawler yang di-load registry
+    "app + crawlers": "import app, antam, g24, hrta, ubs",
+}
+
+PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+t = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t
+heavy = [m for m in ("pandas", "openpyxl", "playwright", "numpy") if m in sys.modules]
+print(json.dumps({{"seconds": elapsed,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "heavy": heavy}}))
+"""
+
+
+def measure(root: str, stmt: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(root=root, stmt=stmt)],
+                             cwd=root, capture_output=True, text=True)
+        if out.returncode != 0:
+            return {"error": out.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def export_ref(ref: str) -> str:
+    """Ekstrak isi commit `ref` ke direktori sementara (git archive, working tree tidak disentuh)."""
+    tmp = tempfile.mkdtemp(prefix="startup-bench-")
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", tmp], input=archive.stdout, check=True)
+    return tmp
+
+
+def report(label: str, root: str, repeat: int) -> None:
+    print(f"\n[{label}] {root}")
+    for name, stmt in SCENARIOS.items():
+        r = measure(root, stmt, repeat)
+        if "error" in r:
+            print(f"  {name:<16} ERROR {r['error']}")
+            continue
+        heavy = ", ".join(r["heavy"]) or "-"
+        print(f"  {name:<16} {r['seconds'] * 1000:8.1f} ms   RSS {r['rss_mb']:7.1f} MB   heavy: {heavy}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--ref", help="commit/branch pembanding (before)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.ref:
+        before = export_ref(args.ref)
+        try:
+            report(f"before: {args.ref}", before, args.repeat)
+        finally:
+            shutil.rmtree(before, ignore_errors=True)
+    report("after: working tree", ROOT, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Server HTTP lokal yang menyajikan halaman vendor dari bench/fixtures (tanpa jaringan).
+
+    python bench/stub_server.py --port 8765 --latency 50
+
+Path:  /antam  /g24  /hrta  /hrta.json  /ubs/catalog  /ubs/buyback
+Response membawa ETag + Last-Modified; If-None-Match yang cocok dijawab 304 (jalur conditional GET crawler).
+"""
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+ROUTES = {
+    "/antam": ("antam.html", "text/html; charset=utf-8"),
+    "/g24": ("g24.html", "text/html; charset=utf-8"),
+    "/hrta": ("hrta.html", "text/html; charset=utf-8"),
+    "/hrta.json": ("hrta.json", "application/json"),
+    "/ubs/catalog": ("ubs_catalog.html", "text/html; charset=utf-8"),
+    "/ubs/buyback": ("ubs_buyback.html", "text/html; charset=utf-8"),
+}
+
+
+class StubServer:
+    """
+    pages: override isi per path (mis. varian besar); latency: jeda per request (detik)
+    untuk meniru RTT server asli.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, pages: dict = None):
+        self.latency = latency
+        self.pages = {path: fixtures.load(name).encode("utf-8") for path, (name, _) in ROUTES.items()}
+        self.pages.update({p: b.encode("utf-8") if isinstance(b, str) else b for p, b in (pages or {}).items()})
+        self.modified = formatdate(time.time(), usegmt=True)
+        self.hits = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, seperti session http_client
+
+            def do_GET(self):
+                server.hits += 1
+                body = server.pages.get(self.path.split("?")[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ROUTES.get(self.path, ("", "text/html; charset=utf-8"))[1])
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", server.modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="jeda per request (ms)")
+    args = ap.parse_args()
+    server = StubServer(args.port, args.latency / 1000)
+    print(f"stub server di {server.base_url}: {', '.join(ROUTES)}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
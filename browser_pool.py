@@ -0,0 +1,248 @@
+import atexit
+import contextvars
+import functools
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+import metrics
+
+POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "1"))
+MAX_PAGES = int(os.environ.get("BROWSER_MAX_PAGES", "50"))         # browser di-recycle setelah N halaman
+IDLE_TIMEOUT = float(os.environ.get("BROWSER_IDLE_TIMEOUT", "120"))  # detik tanpa job -> browser ditutup
+
+# resource yang tidak dibutuhkan untuk membaca angka harga
+BLOCK_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+BLOCK_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "clarity.ms", "tiktok.com",
+)
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    Cara render satu halaman vendor:
+    - resource yang di-abort (jenis resource + host analytics/iklan)
+    - predikat kesiapan: selector + ekspresi JS yang bernilai true begitu angka harga sudah ada,
+      pengganti sleep tetap (wait_for_timeout / time.sleep)
+    Predikat yang tidak terpenuhi sampai ready_timeout_ms tidak dianggap error:
+    HTML tetap dikembalikan dan parser yang memutuskan.
+    """
+    wait_selector: str = "body"
+    ready_js: Optional[str] = None
+    block_types: FrozenSet[str] = BLOCK_TYPES
+    block_hosts: Tuple[str, ...] = BLOCK_HOSTS
+    wait_until: str = "domcontentloaded"
+    goto_timeout_ms: int = 60_000
+    ready_timeout_ms: int = 30_000
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.block_types:
+            return True
+        return any(h in url for h in self.block_hosts)
+
+
+class BrowserPool:
+    """
+    Pool Chromium yang tetap hangat antar crawl.
+
+    Playwright sync API terikat ke thread yang membuatnya, jadi tiap browser
+    hidup di worker thread sendiri dan crawler mengirim job (fungsi yang
+    menerima `page`) lewat antrian. Tiap job dapat browser context baru.
+    - max_pages: browser ditutup & diluncurkan ulang setelah N job (cegah memory leak)
+    - idle_timeout: worker menutup browser & berhenti kalau tidak ada job
+    - crash recovery: kalau browser putus di tengah job, diluncurkan ulang dan job dicoba sekali lagi
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_pages: int = MAX_PAGES,
+                 idle_timeout: float = IDLE_TIMEOUT, ws_endpoint: Optional[str] = None):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self.ws_endpoint = ws_endpoint   # diisi -> connect_over_cdp ke browser remote (mis. Browserless)
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._closed = False
+
+    # ---------- API untuk crawler ----------
+    def run(self, job: Callable[[Any], Any], timeout: Optional[float] = None, **context_kwargs) -> Any:
+        """Jalankan job(page) di browser yang sudah hangat, return hasil job."""
+        fut = Future()
+        # job jalan di thread worker: bawa context pemanggil supaya span render tercatat atas vendornya
+        job = functools.partial(contextvars.copy_context().run, job)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool sudah ditutup")
+            self._jobs.put((job, context_kwargs, fut))
+            if self._workers < self.size:
+                self._workers += 1
+                threading.Thread(target=self._worker, name="browser-pool", daemon=True).start()
+        # termasuk antre menunggu worker / launch browser
+        with metrics.span("render"):
+            return fut.result(timeout=timeout)
+
+    def fetch_html(self, url: str, profile: RenderProfile = RenderProfile(), **context_kwargs) -> str:
+        def job(page):
+            return render_page(page, url, profile)
+        return self.run(job, **context_kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for _ in range(self._workers):
+                self._jobs.put(None)
+
+    # ---------- worker thread ----------
+    def _launch(self, pw):
+        with metrics.span("browser_launch", vendor="browser"):
+            if self.ws_endpoint:
+                return pw.chromium.connect_over_cdp(self.ws_endpoint)
+            return pw.chromium.launch(headless=True)
+
+    def _next_job(self):
+        """
+        Job berikutnya, atau None kalau worker harus berhenti (idle / pool ditutup). Sebelum None
+        dikembalikan worker sudah dikeluarkan dari _workers di lock yang sama dengan keputusan
+        berhenti, jadi run() yang masuk sesudahnya pasti menyalakan worker baru.
+        """
+        while True:
+            try:
+                item = self._jobs.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # cek ulang di bawah lock: job bisa masuk tepat saat timeout
+                    if self._jobs.empty():
+                        self._workers -= 1
+                        return None
+                continue
+            if item is None:   # sinyal close(); run() baru sudah ditolak
+                with self._lock:
+                    self._workers -= 1
+            return item
+
+    def _worker(self) -> None:
+        from playwright.sync_api import sync_playwright
+
+        pw = None
+        browser = None
+        pages = 0
+        counted = True   # masih dihitung di _workers
+        try:
+            pw = sync_playwright().start()
+            while True:
+                item = self._next_job()
+                if item is None:
+                    counted = False
+                    break
+                job, context_kwargs, fut = item
+                if not fut.set_running_or_notify_cancel():
+                    continue
+
+                for attempt in (1, 2):
+                    try:
+                        if browser is None or not browser.is_connected():
+                            browser = self._launch(pw)
+                            pages = 0
+                        result = self._run_job(browser, job, context_kwargs)
+                        fut.set_result(result)
+                        break
+                    except Exception as e:
+                        crashed = browser is None or not browser.is_connected()
+                        if crashed and attempt == 1:
+                            print(f"[BROWSER] browser crash, launch ulang: {e}")
+                            browser = None
+                            continue
+                        fut.set_exception(e)
+                        break
+
+                pages += 1
+                if browser is not None and pages >= self.max_pages:
+                    _safe_close(browser)
+                    browser = None
+        except Exception as e:
+            print(f"[BROWSER] worker berhenti: {e}")
+        finally:
+            with self._lock:
+                if counted:   # berhenti karena error, bukan lewat _next_job
+                    self._workers -= 1
+                orphan = self._workers == 0 and not self._jobs.empty()
+            if browser is not None:
+                _safe_close(browser)
+            if pw is not None:
+                try:
+                    pw.stop()
+                except Exception:
+                    pass
+            if orphan:
+                self._fail_pending("worker browser berhenti")
+
+    def _run_job(self, browser, job, context_kwargs):
+        context = browser.new_context(**context_kwargs)
+        try:
+            page = context.new_page()
+            return job(page)
+        finally:
+            _safe_close(context)
+
+    def _fail_pending(self, reason: str) -> None:
+        while True:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item[2].set_exception(RuntimeError(reason))
+
+
+def render_page(page, url: str, profile: RenderProfile) -> str:
+    """Buka url di page sesuai profile, tunggu sampai data siap, return HTML."""
+    if profile.block_types or profile.block_hosts:
+        def handle(route):
+            req = route.request
+            if profile.should_block(req.resource_type, req.url):
+                route.abort()
+            else:
+                route.continue_()
+        page.route("**/*", handle)
+
+    with metrics.span("render.goto"):
+        page.goto(url, wait_until=profile.wait_until, timeout=profile.goto_timeout_ms)
+    try:
+        with metrics.span("render.wait"):
+            page.wait_for_selector(profile.wait_selector, timeout=profile.ready_timeout_ms)
+            if profile.ready_js:
+                page.wait_for_function(profile.ready_js, timeout=profile.ready_timeout_ms)
+    except Exception as e:
+        print(f"[BROWSER] data belum siap di {url}: {e}")
+    return page.content()
+
+
+def _safe_close(obj) -> None:
+    try:
+        obj.close()
+    except Exception:
+        pass
+
+
+_pools: Dict[str, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str = "local", **kwargs) -> BrowserPool:
+    """Pool bersama per nama (mis. 'local' untuk Chromium lokal, 'browserless' untuk remote)."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = BrowserPool(**kwargs)
+        return pool
+
+
+@atexit.register
+def _close_all() -> None:
+    for pool in list(_pools.values()):
+        pool.close()
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import metrics
+
+# TTL default bisa di-override lewat environment variable (mis. di dashboard Vercel)
+DEFAULT_TTL = float(os.environ.get("PRICE_CACHE_TTL", "300"))
+DEFAULT_STALE_TTL = float(os.environ.get("PRICE_CACHE_STALE", "3600"))
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "ttl")
+
+    def __init__(self, value: Any, ttl: float):
+        self.value = value
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class PriceCache:
+    """
+    Cache hasil crawl per key (vendor) dengan:
+    - TTL: selama umur < ttl, data langsung dikembalikan
+    - stale-while-revalidate: umur < ttl + stale_ttl -> data lama dikembalikan,
+      crawl baru jalan di background
+    - single-flight: request bersamaan untuk key yang sama menunggu 1 crawl yang sama
+    Error dari loader tidak pernah di-cache.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, stale_ttl: float = DEFAULT_STALE_TTL):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = entry.age()
+                if age < entry.ttl:
+                    metrics.inc("cache_requests_total", key=key, result="hit")
+                    return entry.value
+                if age < entry.ttl + self.stale_ttl:
+                    # data basi tapi masih layak tampil -> refresh di background
+                    metrics.inc("cache_requests_total", key=key, result="stale")
+                    self._start_locked(key, loader, ttl)
+                    return entry.value
+            metrics.inc("cache_requests_total", key=key, result="miss")
+            fut = self._start_locked(key, loader, ttl)
+
+        try:
+            return fut.result()
+        except Exception:
+            # crawl gagal: kalau masih ada data lama (walau expired), lebih baik tampilkan itu
+            if entry is not None:
+                return entry.value
+            raise
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Ambil data dari cache tanpa memicu crawl (None kalau belum ada)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value, self.ttl if ttl is None else ttl)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _start_locked(self, key: str, loader: Callable[[], Any], ttl: float) -> Future:
+        # caller wajib memegang self._lock
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return fut
+
+        fut = Future()
+        self._inflight[key] = fut
+        # crawl selalu jalan di thread sendiri; pemanggil foreground cukup menunggu future-nya
+        threading.Thread(target=self._run, args=(key, loader, ttl, fut), daemon=True).start()
+        return fut
+
+    def _run(self, key: str, loader: Callable[[], Any], ttl: float, fut: Future) -> None:
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+            return
+
+        with self._lock:
+            self._entries[key] = _Entry(value, ttl)
+            self._inflight.pop(key, None)
+        fut.set_result(value)
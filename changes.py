@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import requests
+
+import http_client
+from result import CrawlResult
+
+
+class _PageState:
+    __slots__ = ("etag", "last_modified", "fingerprint", "rows", "changed_at")
+
+    def __init__(self):
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fingerprint: Optional[str] = None
+        self.rows: Optional[List[dict]] = None
+        self.changed_at: Optional[str] = None
+
+
+class ChangeTracker:
+    """
+    Deteksi halaman vendor yang tidak berubah sejak crawl terakhir (per proses, di memory):
+    - conditional GET: If-None-Match / If-Modified-Since dari response sebelumnya -> 304
+    - fingerprint subtree harga (tabel / container) kalau server tidak mendukung validator
+    Kalau tidak berubah, baris hasil parse terakhir dikembalikan dengan unchanged_since terisi,
+    jadi parsing, penulisan store dan update client bisa dilewati.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, _PageState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, url: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """GET biasa + header kondisional. Status 304 tidak di-raise, cek lewat unchanged()."""
+        headers = dict(headers or {})
+        with self._lock:
+            st = self._states.get(key)
+            # validator hanya berguna kalau baris lama masih ada untuk dikembalikan
+            if st is not None and st.rows is not None:
+                if st.etag:
+                    headers["If-None-Match"] = st.etag
+                if st.last_modified:
+                    headers["If-Modified-Since"] = st.last_modified
+        return http_client.get(url, headers=headers, **kwargs)
+
+    def unchanged(self, key: str, response: Optional[requests.Response] = None,
+                  fingerprint: Optional[str] = None) -> Optional[CrawlResult]:
+        """Baris lama (CrawlResult.unchanged_since) kalau 304 / fingerprint sama, selain itu None."""
+        with self._lock:
+            st = self._states.get(key)
+            if st is None or st.rows is None:
+                return None
+            not_modified = response is not None and response.status_code == 304
+            if not not_modified and (fingerprint is None or fingerprint != st.fingerprint):
+                return None
+            return CrawlResult(st.rows, unchanged_since=st.changed_at)
+
+    def remember(self, key: str, rows: List[dict], response: Optional[requests.Response] = None,
+                 fingerprint: Optional[str] = None) -> List[dict]:
+        """Simpan validator + fingerprint + baris hasil parse terbaru. Hasil kosong tidak diingat."""
+        if not rows:
+            return rows
+        st = _PageState()
+        if response is not None:
+            st.etag = response.headers.get("ETag")
+            st.last_modified = response.headers.get("Last-Modified")
+        st.fingerprint = fingerprint
+        st.rows = list(rows)
+        st.changed_at = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self._states[key] = st
+        return rows
+
+    def forget(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+
+
+def fingerprint(fragment: Union[str, bytes, None]) -> Optional[str]:
+    if not fragment:
+        return None
+    if isinstance(fragment, str):
+        fragment = fragment.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(fragment, digest_size=16).hexdigest()
+
+
+tracker = ChangeTracker()
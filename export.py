@@ -0,0 +1,128 @@
+"""
+Export harga ke xlsx / CSV / Parquet tanpa pandas dan tanpa memuat semua baris sekaligus:
+baris dibaca dari iterable per sheet (cache / price store) dan langsung ditulis.
+
+- csv     : generator string, bisa langsung di-stream sebagai response
+- xlsx    : openpyxl write_only (baris di-flush ke file sementara, bukan disimpan di memory)
+- parquet : pyarrow (opsional), ditulis per row group
+"""
+import csv
+import io
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+import metrics
+import records
+
+COLUMNS = list(records.COLUMNS)
+HISTORY_COLUMNS = COLUMNS + ["Waktu Crawl"]
+
+FORMATS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "csv": ("text/csv", "csv"),   # Response(mimetype=...) menambahkan "; charset=utf-8" sendiri
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+CHUNK_SIZE = 64 * 1024
+PARQUET_BATCH = 5000
+# file sementara tetap di memory sampai ukuran ini, di atasnya pindah ke disk
+SPOOL_MAX = 8 * 1024 * 1024
+
+# baris: PriceRow (cache / crawler) atau dict (riwayat dari store)
+Sheets = Dict[str, Iterable[Union[records.PriceRow, dict]]]
+
+
+def iter_csv(sheets: Sheets, columns: Sequence[str] = COLUMNS) -> Iterator[str]:
+    """Semua sheet jadi 1 CSV (kolom Vendor membedakan asal baris)."""
+    # span export = waktu kerja generator saja, tanpa waktu menunggu client membaca chunk
+    busy = 0.0
+    t = time.perf_counter()
+    try:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(columns)
+        for rows in sheets.values():
+            for r in rows:
+                writer.writerow([r.get(c) for c in columns])
+                if buf.tell() >= CHUNK_SIZE:
+                    busy += time.perf_counter() - t
+                    yield buf.getvalue()
+                    t = time.perf_counter()
+                    buf.seek(0)
+                    buf.truncate()
+        busy += time.perf_counter() - t
+        yield buf.getvalue()
+    finally:
+        metrics.observe("export", busy)
+
+
+@metrics.timed("export")
+def write_xlsx(sheets: Sheets, fileobj, columns: Sequence[str] = COLUMNS) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(title=name[:31])   # batas nama sheet Excel
+        ws.append(list(columns))
+        for r in rows:
+            ws.append([r.get(c) for c in columns])
+    if not wb.worksheets:
+        wb.create_sheet(title="KOSONG").append(list(columns))
+    wb.save(fileobj)
+
+
+@metrics.timed("export")
+def write_parquet(sheets: Sheets, fileobj, columns: Sequence[str] = COLUMNS) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("export parquet butuh paket pyarrow (pip install pyarrow)")
+
+    types = {"Gramasi": pa.float64(), "Harga Beli": pa.int64(), "Harga Buyback": pa.int64()}
+    schema = pa.schema([(c, types.get(c, pa.string())) for c in columns])
+    with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+        batch: List[dict] = []
+        for rows in sheets.values():
+            for r in rows:
+                batch.append({c: r.get(c) for c in columns})
+                if len(batch) >= PARQUET_BATCH:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+
+def iter_file(fileobj) -> Iterator[bytes]:
+    """Baca file sementara dari awal per chunk, lalu tutup."""
+    try:
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def export_stream(fmt: str, sheets: Sheets, columns: Sequence[str] = COLUMNS) -> Iterator[bytes]:
+    """
+    Body export sebagai iterator bytes. xlsx/parquet harus selesai ditulis dulu (format zip / footer),
+    jadi ditulis ke file sementara lalu di-stream; CSV langsung di-stream per chunk.
+    """
+    if fmt == "csv":
+        return (s.encode("utf-8") for s in iter_csv(sheets, columns))
+    if fmt not in FORMATS:
+        raise ValueError(f"format export tidak dikenal: {fmt}")
+    tmp = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+    try:
+        if fmt == "xlsx":
+            write_xlsx(sheets, tmp, columns)
+        else:
+            write_parquet(sheets, tmp, columns)
+    except Exception:
+        tmp.close()
+        raise
+    return iter_file(tmp)
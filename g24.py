@@ -1,70 +1,41 @@
 import re
 import urllib3
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+
+import metrics
+from changes import fingerprint, tracker
+from export import write_xlsx
+from normalize import HEADERS, clean_currency_many, clean_gram_many, parse_tanggal_update
+from parsing import STRAIN_G24, Document, as_soup, make_soup
+from records import PriceRow
 
 # Disable warning SSL (kadang Galeri24 bermasalah SSL chain di beberapa network)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 URL = "https://galeri24.co.id/harga-emas"  # fragment #... tidak perlu untuk requests
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.7,en;q=0.6",
-}
-
-BULAN_ID = {
-    "januari": 1, "februari": 2, "maret": 3, "april": 4, "mei": 5, "juni": 6,
-    "juli": 7, "agustus": 8, "september": 9, "oktober": 10, "november": 11, "desember": 12
-}
-
-def clean_currency(price_str: str) -> int:
-    """Rp1.555.000 -> 1555000"""
-    if not price_str:
-        return 0
-    digits = re.sub(r"[^\d]", "", str(price_str))
-    return int(digits) if digits else 0
-
-def clean_gram(gram_str: str) -> float:
-    """'0.5' -> 0.5"""
-    if not gram_str:
-        return 0.0
-    s = re.sub(r"[^\d\.,]", "", str(gram_str)).replace(",", ".")
-    try:
-        return float(s)
-    except:
-        return 0.0
-
-def parse_tanggal_update(text: str) -> str:
-    """
-    Ambil dari: "Diperbarui Selasa, 27 Januari 2026"
-    fallback: yyyy-mm-dd hari ini
-    """
-    # cari "27 Januari 2026"
-    m = re.search(r"(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})", text, re.IGNORECASE)
-    if not m:
-        return datetime.now().strftime("%Y-%m-%d")
-
-    d = int(m.group(1))
-    bulan = m.group(2).lower()
-    y = int(m.group(3))
-    if bulan not in BULAN_ID:
-        return datetime.now().strftime("%Y-%m-%d")
-
-    try:
-        return datetime(y, BULAN_ID[bulan], d).strftime("%Y-%m-%d")
-    except:
-        return datetime.now().strftime("%Y-%m-%d")
-
-def crawl_g24_only() -> list[dict]:
-    print(f"Ambil data G24 dari: {URL}")
-    resp = requests.get(URL, headers=HEADERS, verify=False, timeout=25)
-    resp.raise_for_status()
+SEMIBOLD_RE = re.compile(r"\bfont-semibold\b")
+GRID_ROW_RE = re.compile(r"\bgrid-cols-5\b")
+CONTAINER_RE = re.compile(r"""<div\b[^>]*\bid=["']GALERI 24["']""")
+DIV_TAG_RE = re.compile(r"<(/?)div\b", re.IGNORECASE)
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+def container_fragment(html: str) -> str:
+    """Potongan HTML mentah <div id="GALERI 24"> s/d </div> penutupnya ('' kalau tidak ada), tanpa parse DOM."""
+    m = CONTAINER_RE.search(html)
+    if not m:
+        return ""
+    depth = 0
+    for tag in DIV_TAG_RE.finditer(html, m.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = html.find(">", tag.end())
+            return html[m.start():end + 1 if end != -1 else len(html)]
+    return html[m.start():]
+
+@metrics.timed("parse")
+def parse_g24(html: Document) -> list[PriceRow]:
+    # cukup bangun subtree <div id="GALERI 24">, bagian halaman lain dilewati
+    soup = as_soup(html, STRAIN_G24)
 
     # target persis: <div id="GALERI 24">
     container = soup.find("div", id="GALERI 24")
@@ -72,14 +43,14 @@ def crawl_g24_only() -> list[dict]:
         raise RuntimeError("Container <div id='GALERI 24'> tidak ditemukan. Struktur halaman mungkin berubah / belum ke-render.")
 
     # tanggal update ada di div: class "text-lg font-semibold mb-4"
-    date_elem = container.find("div", class_=re.compile(r"\bfont-semibold\b"))
+    date_elem = container.find("div", class_=SEMIBOLD_RE)
     tanggal = parse_tanggal_update(date_elem.get_text(" ", strip=True) if date_elem else "")
 
     # header row punya "Berat", jadi kita skip
     # baris data adalah div dengan class mengandung 'grid-cols-5' + punya 3 kolom utama (berat/jual/buyback)
-    rows = container.find_all("div", class_=re.compile(r"\bgrid-cols-5\b"))
+    rows = container.find_all("div", class_=GRID_ROW_RE)
 
-    data = []
+    gram_txts, jual_txts, buyback_txts = [], [], []
     for row in rows:
         txt = row.get_text(" ", strip=True)
         if not txt:
@@ -92,46 +63,51 @@ def crawl_g24_only() -> list[dict]:
         if len(cols) < 3:
             continue
 
-        gram_txt = cols[0].get_text(strip=True)
-        jual_txt = cols[1].get_text(strip=True)
-        buyback_txt = cols[2].get_text(strip=True)
-
-        gram = clean_gram(gram_txt)
-        harga_beli = clean_currency(jual_txt)        # Harga Jual = harga beli customer
-        harga_buyback = clean_currency(buyback_txt)  # Harga Buyback
+        gram_txts.append(cols[0].get_text(strip=True))
+        jual_txts.append(cols[1].get_text(strip=True))     # Harga Jual = harga beli customer
+        buyback_txts.append(cols[2].get_text(strip=True))  # Harga Buyback
 
+    return [
+        PriceRow("GALERI 24", tanggal, gram, harga_beli, harga_buyback)
+        for gram, harga_beli, harga_buyback in zip(clean_gram_many(gram_txts).values,
+                                                   clean_currency_many(jual_txts).values,
+                                                   clean_currency_many(buyback_txts).values)
         # filter noise
-        if gram <= 0 or (harga_beli == 0 and harga_buyback == 0):
-            continue
+        if gram > 0 and (harga_beli or harga_buyback)
+    ]
 
-        data.append({
-            "Vendor": "GALERI 24",
-            "Tanggal": tanggal,
-            "Gramasi": gram,
-            "Harga Beli": harga_beli,
-            "Harga Buyback": harga_buyback
-        })
-
-    # dedup (kadang ada baris kebaca dobel)
-    # key: (Gramasi)
-    dedup = {}
-    for r in data:
-        dedup[r["Gramasi"]] = r
-    result = [dedup[k] for k in sorted(dedup.keys())]
+def crawl_g24_only() -> list[PriceRow]:
+    print(f"Ambil data G24 dari: {URL}")
+    resp = tracker.get("g24", URL, headers=HEADERS, verify=False, timeout=25)
+    resp.raise_for_status()
 
+    # 304, atau teks mentah div#GALERI 24 sama dengan crawl terakhir -> baris lama, tanpa parse
+    # (seperti antam.table_fragment: tab merek lain / banner di sekitarnya boleh berubah)
+    fp = fingerprint(container_fragment(resp.text)) if resp.status_code != 304 else None
+    same = tracker.unchanged("g24", resp, fp)
+    if same is not None:
+        print(f"Tidak berubah sejak {same.unchanged_since} ({len(same)} baris).")
+        metrics.inc("crawl_path_total", vendor="g24", path="unchanged")
+        return same
+
+    with metrics.span("parse"):
+        soup = make_soup(resp.text, STRAIN_G24)
+    result = parse_g24(soup)
     print(f"Berhasil ambil {len(result)} baris.")
-    return result
+    metrics.inc("crawl_path_total", vendor="g24", path="grid")
+    return tracker.remember("g24", result, resp, fp)
 
 def main():
-    data = crawl_g24_only()
-    df = pd.DataFrame(data, columns=["Vendor", "Tanggal", "Gramasi", "Harga Beli", "Harga Buyback"])
-    df = df.sort_values("Gramasi").reset_index(drop=True)
+    from vendors import get_vendor
+    data = get_vendor("g24").crawl()   # lewat registry: sudah di-dedup & urut per gramasi
 
     filename = f"Harga_GALERI24_{datetime.now().strftime('%Y%m%d')}.xlsx"
-    df.to_excel(filename, index=False)
+    with open(filename, "wb") as f:
+        write_xlsx({"GALERI24": data}, f)
 
     print(f"SUKSES -> {filename}")
-    print(df)
+    for r in data:
+        print(r)
 
 if __name__ == "__main__":
     main()
@@ -1,80 +1,96 @@
-import re
+import json
+import os
+import tempfile
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlsplit
 
-import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+import http_client
+import metrics
+from browser_pool import RenderProfile, get_pool, render_page
+from export import write_xlsx
+from normalize import HEADERS, clean_currency, clean_currency_many, clean_gram, clean_gram_many, today_iso
+from parsing import STRAIN_HRTA_TABLE, make_soup
+from records import PriceRow
+from vendors import FETCH_JSON, FETCH_RENDER, fetch_strategy, get_vendor
 
 URL = "https://hrtagold.id/id/gold-price"
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.7,en;q=0.6",
-}
-
-def clean_currency(price_str: str) -> int:
-    """'Rp 364.500' -> 364500"""
-    if not price_str:
-        return 0
-    digits = re.sub(r"[^\d]", "", str(price_str))
-    return int(digits) if digits else 0
-
-def clean_gram(gram_str: str) -> float:
-    """'0.1 gr' / '0.1\xa0gr' -> 0.1"""
-    if not gram_str:
-        return 0.0
-    s = str(gram_str).replace("\xa0", " ").strip().replace(",", ".")
-    m = re.search(r"(\d+(?:\.\d+)?)", s)
-    if not m:
-        return 0.0
-    try:
-        return float(m.group(1))
-    except:
-        return 0.0
+# Tabel diisi lewat JS: siap kalau sudah ada baris data dengan angka di kolom harga
+RENDER_PROFILE = RenderProfile(
+    wait_selector='table[data-slot="table"]',
+    ready_js="""() => [...document.querySelectorAll('table[data-slot="table"] tr[data-slot="table-row"]')]
+        .some(tr => { const td = tr.querySelectorAll('td[data-slot="table-cell"]');
+                      return td.length >= 3 && /\\d/.test(td[1].textContent); })""",
+)
 
-def fetch_html_rendered(url: str) -> str:
-    from playwright.sync_api import sync_playwright
-    import os
-
-    # Ambil API KEY dari Browserless (Disarankan pakai Environment Variable di Vercel)
-    # Jika di lokal, kamu bisa tempel langsung string API-nya
-    BROWSERLESS_API_KEY = "2TsTyTUm4dH4KX49478023f0062631c99d06a126619e2169a" 
-    
-    # Endpoint WebSocket untuk Browserless
-    ws_endpoint = f"wss://chrome.browserless.io/playwright?token={BROWSERLESS_API_KEY}"
-
-    with sync_playwright() as p:
-        # PENTING: Gunakan connect_over_cdp, BUKAN p.chromium.launch
-        browser = p.chromium.connect_over_cdp(ws_endpoint)
-        
+# API KEY Browserless hanya dari Environment Variable, jangan ditulis di kode; tanpa key render pakai Chromium lokal
+BROWSERLESS_API_KEY = os.environ.get("BROWSERLESS_API_KEY")
+
+# Endpoint WebSocket untuk Browserless
+WS_ENDPOINT = "wss://chrome.browserless.io/playwright?token={token}"
+
+# File tempat endpoint JSON hasil capture disimpan: di folder project, bukan /tmp bersama
+# (Vercel: filesystem read-only kecuali /tmp)
+_DEFAULT_ENDPOINT_FILE = os.path.join("/tmp", "hrta_endpoint.json") if os.environ.get("VERCEL") else "hrta_endpoint.json"
+ENDPOINT_FILE = os.environ.get("HRTA_ENDPOINT_FILE", _DEFAULT_ENDPOINT_FILE)
+
+# spec endpoint hanya boleh menunjuk ke host Hartadinata (file spec bisa saja ditulis pihak lain)
+ENDPOINT_HOSTS = ("hrtagold.id",)
+
+def fetch_rendered_with_capture(url: str) -> tuple[str, list[dict]]:
+    """
+    Render halaman sekali sambil merekam semua response XHR/fetch berformat JSON.
+    Return (html, [{"url", "method", "post_data", "json"}, ...])
+    """
+    def job(page):
+        responses = []
+
+        def on_response(resp):
+            if resp.request.resource_type in ("xhr", "fetch"):
+                responses.append(resp)
+
+        page.on("response", on_response)
+        # tidak perlu 'networkidle' / delay tetap: cukup tunggu sampai sel harga terisi
+        html = render_page(page, url, RENDER_PROFILE)
+
+        captured = []
+        for resp in responses:
+            if "json" not in (resp.headers.get("content-type") or ""):
+                continue
+            try:
+                body = resp.json()
+            except Exception:
+                continue
+            captured.append({
+                "url": resp.url,
+                "method": resp.request.method,
+                "post_data": resp.request.post_data,
+                "json": body,
+            })
+        return html, captured
+
+    if BROWSERLESS_API_KEY:
+        # Vercel: browser remote (connect_over_cdp), BUKAN p.chromium.launch.
+        # Koneksi ke Browserless disimpan di pool, tiap crawl cukup buka context baru
+        pool = get_pool("browserless", ws_endpoint=WS_ENDPOINT.format(token=BROWSERLESS_API_KEY))
+    else:
+        # tanpa key (batch runner di lokal): Chromium lokal yang sama dengan ANTAM
+        pool = get_pool()
+    try:
         # Buat context baru dengan User Agent agar tidak dicurigai sebagai bot
-        context = browser.new_context(user_agent=HEADERS["User-Agent"])
-        page = context.new_page()
+        return pool.run(job, user_agent=HEADERS["User-Agent"])
+    except Exception as e:
+        print(f"Scraping Error: {e}")
+        return "", []
 
-        try:
-            # Gunakan 'networkidle' agar lebih stabil (menunggu semua request API selesai)
-            page.goto(url, wait_until="networkidle", timeout=60000)
-            
-            # Tunggu selector tabel muncul
-            page.wait_for_selector('table[data-slot="table"]', timeout=30000)
-            
-            # Delay dikit buat VFX render tabelnya
-            page.wait_for_timeout(2000)
-            
-            html = page.content()
-        except Exception as e:
-            print(f"Scraping Error: {e}")
-            html = ""
-        finally:
-            browser.close()
-            
-        return html
-
-def crawl_hartadinata() -> list[dict]:
-    print(f"Sedang mengambil data Hartadinata dari: {URL} ... (Playwright)")
+def fetch_html_rendered(url: str) -> str:
+    html, _ = fetch_rendered_with_capture(url)
+    return html
 
-    html = fetch_html_rendered(URL)
-    soup = BeautifulSoup(html, "html.parser")
+@metrics.timed("parse")
+def parse_table(html: str) -> list[PriceRow]:
+    soup = make_soup(html, STRAIN_HRTA_TABLE)
 
     table = soup.select_one('table[data-slot="table"]')
     if not table:
@@ -86,10 +102,10 @@ def crawl_hartadinata() -> list[dict]:
 
     rows = tbody.select('tr[data-slot="table-row"]')
 
-    data_list = []
     current_category = "General"
-    tanggal = datetime.now().strftime("%Y-%m-%d")
+    tanggal = today_iso()
 
+    categories, gram_txts, dasar_txts, buyback_txts = [], [], [], []
     for row in rows:
         cols = row.select('td[data-slot="table-cell"]')
         if not cols:
@@ -102,53 +118,227 @@ def crawl_hartadinata() -> list[dict]:
 
         # data: minimal 3 kolom
         if len(cols) >= 3:
-            gram_txt = cols[0].get_text(" ", strip=True)
-            dasar_txt = cols[1].get_text(" ", strip=True)
-            buyback_txt = cols[2].get_text(" ", strip=True)
-
-            gram = clean_gram(gram_txt)
-            harga_beli = clean_currency(dasar_txt)       # Harga Dasar
-            harga_buyback = clean_currency(buyback_txt)  # Buyback
-
-            if gram > 0:
-                data_list.append({
-                    "Vendor": f"HARTADINATA ({current_category})",
-                    "Tanggal": tanggal,
-                    "Gramasi": gram,
-                    "Harga Beli": harga_beli,
-                    "Harga Buyback": harga_buyback,
-                })
-
-    # dedup (kadang dobel)
-    dedup = {}
-    for r in data_list:
-        key = (r["Vendor"], r["Gramasi"])
-        dedup[key] = r
-
-    out = [dedup[k] for k in sorted(dedup.keys(), key=lambda x: (x[0], x[1]))]
-    print(f"Berhasil mendapatkan {len(out)} data.")
-    return out
+            categories.append(current_category)
+            gram_txts.append(cols[0].get_text(" ", strip=True))
+            dasar_txts.append(cols[1].get_text(" ", strip=True))    # Harga Dasar
+            buyback_txts.append(cols[2].get_text(" ", strip=True))  # Buyback
+
+    return [
+        PriceRow(f"HARTADINATA ({category})", tanggal, gram, harga_beli, harga_buyback)
+        for category, gram, harga_beli, harga_buyback in zip(categories, clean_gram_many(gram_txts).values,
+                                                             clean_currency_many(dasar_txts).values,
+                                                             clean_currency_many(buyback_txts).values)
+        if gram > 0
+    ]
+
+# =========================
+# Mode endpoint JSON langsung
+# =========================
+def _walk_items(obj, path=(), parents=()):
+    """Yield (pola_path, item_dict, parent_dicts) untuk tiap dict di dalam list; index list -> '*'."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _walk_items(v, path + (k,), parents + (obj,))
+    elif isinstance(obj, list):
+        for v in obj:
+            if isinstance(v, dict):
+                yield path + ("*",), v, parents
+            yield from _walk_items(v, path + ("*",), parents)
+
+def _best_key(items: list[dict], targets: set, convert) -> Optional[str]:
+    best, best_hits = None, 0
+    keys = {k for it in items for k, v in it.items() if not isinstance(v, (dict, list))}
+    for k in keys:
+        hits = sum(1 for it in items if k in it and convert(it[k]) in targets)
+        if hits > best_hits:
+            best, best_hits = k, hits
+    # minimal separuh baris tabel harus cocok supaya tidak salah tebak
+    return best if best_hits * 2 >= len(targets) else None
+
+def learn_endpoint(captured: list[dict], rows: list[PriceRow]) -> Optional[dict]:
+    """
+    Cari response JSON yang isinya sama dengan tabel hasil render, lalu simpan
+    path list + nama field untuk gram / harga dasar / buyback / kategori.
+    """
+    if not rows:
+        return None
+    grams = {r.gramasi for r in rows}
+    beli = {r.harga_beli for r in rows if r.harga_beli > 0}
+    buyback = {r.harga_buyback for r in rows if r.harga_buyback > 0}
+    categories = {r.vendor[len("HARTADINATA ("):-1] for r in rows}
+
+    best = None
+    for cap in captured:
+        # XHR ke pihak ketiga (analytics, CDN) tidak boleh jadi sumber harga
+        if not endpoint_allowed(cap["url"], cap["method"]):
+            continue
+        groups: dict = {}
+        for path, item, parents in _walk_items(cap["json"]):
+            groups.setdefault(path, []).append((item, parents))
+
+        for path, entries in groups.items():
+            items = [it for it, _ in entries]
+            # angka JSON (1420000 / 1420000.0) langsung di-cast; dict / list / bool dianggap kosong
+            gram_key = _best_key(items, grams, clean_gram)
+            beli_key = _best_key(items, beli, clean_currency) if beli else None
+            bb_key = _best_key(items, buyback, clean_currency) if buyback else None
+            if not gram_key or not (beli_key or bb_key):
+                continue
+
+            # kategori bisa ada di item itu sendiri atau di dict induknya
+            category = None
+            item0, parents0 = entries[0]
+            for depth, d in enumerate(list(parents0) + [item0]):
+                for k, v in d.items():
+                    if isinstance(v, str) and v.strip().title() in categories:
+                        category = [depth, k]
+            # tanpa field kategori semua baris jadi 'General' dan dedup menggabungkan kategorinya
+            if category is None and len(categories) > 1:
+                continue
+            spec = {
+                "url": cap["url"],
+                "method": cap["method"],
+                "post_data": cap["post_data"],
+                "path": list(path),
+                "gram": gram_key,
+                "beli": beli_key,
+                "buyback": bb_key,
+                "category": category,
+                "saved_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            # spec dipakai terus selama endpoint mengembalikan baris, jadi harus menghasilkan tabel yang sama persis
+            if _row_set(extract_rows_from_json(cap["json"], spec)) != _row_set(rows):
+                continue
+            score = len(items)
+            if best is None or score > best[0]:
+                best = (score, spec)
+    return best[1] if best else None
+
+def _row_set(rows: list[PriceRow]) -> set:
+    return {(r.vendor, r.gramasi, r.harga_beli, r.harga_buyback) for r in rows}
+
+def endpoint_allowed(url: str, method: Optional[str] = "GET") -> bool:
+    """URL https/http di host Hartadinata (atau subdomain-nya), method GET / POST."""
+    try:
+        parts = urlsplit(url)
+    except (TypeError, ValueError):
+        return False
+    host = (parts.hostname or "").lower()
+    return (parts.scheme in ("http", "https") and (method or "GET").upper() in ("GET", "POST")
+            and any(host == h or host.endswith("." + h) for h in ENDPOINT_HOSTS))
+
+def load_endpoint() -> Optional[dict]:
+    try:
+        with open(ENDPOINT_FILE, encoding="utf-8") as f:
+            spec = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(spec, dict) or not endpoint_allowed(spec.get("url"), spec.get("method")):
+        print(f"Spec endpoint di {ENDPOINT_FILE} diabaikan: bukan endpoint Hartadinata")
+        return None
+    return spec
+
+def save_endpoint(spec: dict) -> None:
+    # tulis ke file sementara lalu os.replace: symlink di path tujuan diganti, tidak diikuti
+    folder = os.path.dirname(os.path.abspath(ENDPOINT_FILE))
+    try:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=folder, suffix=".tmp", delete=False) as f:
+            json.dump(spec, f, indent=2)
+        os.replace(f.name, ENDPOINT_FILE)
+        print(f"Endpoint JSON Hartadinata disimpan: {spec['url']}")
+    except OSError as e:
+        print(f"Gagal simpan endpoint: {e}")
+
+def extract_rows_from_json(data, spec: dict) -> list[PriceRow]:
+    tanggal = today_iso()
+    path = tuple(spec["path"])
+    categories, gram_vals, beli_vals, bb_vals = [], [], [], []
+    for p, item, parents in _walk_items(data):
+        if p != path:
+            continue
+        category = "General"
+        if spec.get("category"):
+            depth, key = spec["category"]
+            chain = list(parents) + [item]
+            if depth < len(chain) and chain[depth].get(key):
+                category = str(chain[depth][key]).strip().title()
+        categories.append(category)
+        gram_vals.append(item.get(spec["gram"]))
+        beli_vals.append(item.get(spec["beli"]) if spec.get("beli") else None)
+        bb_vals.append(item.get(spec["buyback"]) if spec.get("buyback") else None)
+
+    return [
+        PriceRow(f"HARTADINATA ({category})", tanggal, gram, beli, buyback)
+        for category, gram, beli, buyback in zip(categories, clean_gram_many(gram_vals).values,
+                                                 clean_currency_many(beli_vals).values,
+                                                 clean_currency_many(bb_vals).values)
+        if gram > 0
+    ]
+
+def fetch_via_endpoint(spec: dict) -> list[PriceRow]:
+    headers = dict(HEADERS, Accept="application/json", Referer=URL)
+    with metrics.span("fetch"):
+        resp = http_client.get_session().request(spec.get("method") or "GET", spec["url"], headers=headers,
+                                                 data=spec.get("post_data"), timeout=20)
+    metrics.observe("ttfb", resp.elapsed.total_seconds())
+    resp.raise_for_status()
+    with metrics.span("parse"):
+        return extract_rows_from_json(resp.json(), spec)
+
+def crawl_hartadinata() -> list[PriceRow]:
+    # langkah yang dideklarasikan registry (vendors.VENDORS["hrta"].fetch)
+    strategy = fetch_strategy("hrta")
+
+    # 1) endpoint JSON hasil capture sebelumnya: cukup 1 request HTTP
+    spec = load_endpoint() if FETCH_JSON in strategy else None
+    if spec:
+        print(f"Sedang mengambil data Hartadinata dari endpoint: {spec['url']} ...")
+        try:
+            rows = fetch_via_endpoint(spec)
+            if rows:
+                print(f"Berhasil mendapatkan {len(rows)} data (endpoint JSON).")
+                metrics.inc("crawl_path_total", vendor="hrta", path="endpoint")
+                return rows
+            print("Endpoint tidak mengembalikan data, fallback ke browser.")
+        except Exception as e:
+            print(f"Endpoint gagal ({e}), fallback ke browser.")
+        metrics.inc("crawl_path_total", vendor="hrta", path="endpoint_failed")
+
+    # 2) fallback: render di browser, sekalian rekam XHR untuk crawl berikutnya
+    if FETCH_RENDER not in strategy:
+        raise RuntimeError("endpoint JSON Hartadinata tidak tersedia dan render browser tidak diizinkan registry")
+    print(f"Sedang mengambil data Hartadinata dari: {URL} ... (Playwright)")
+    html, captured = fetch_rendered_with_capture(URL)
+    rows = parse_table(html)
+
+    learned = learn_endpoint(captured, rows) if FETCH_JSON in strategy else None
+    if learned:
+        save_endpoint(learned)
+
+    print(f"Berhasil mendapatkan {len(rows)} data.")
+    metrics.inc("crawl_path_total", vendor="hrta", path="browser")
+    return rows
 
 def main():
     print("=== START HARTADINATA CRAWLER (PLAYWRIGHT) ===\n")
 
     try:
-        data = crawl_hartadinata()
+        data = get_vendor("hrta").crawl()
     except Exception as e:
         print(f"[ERROR] {e}")
         print("\nGAGAL mengambil data.")
         return
 
-    df = pd.DataFrame(data)
-    df = df.sort_values(by=["Vendor", "Gramasi"]).reset_index(drop=True)
-
+    # registry sudah dedup & mengurutkan per (Vendor, Gramasi)
     filename = f"Harga_Hartadinata_{datetime.now().strftime('%Y%m%d')}.xlsx"
-    df.to_excel(filename, index=False)
+    with open(filename, "wb") as f:
+        write_xlsx({"HARTADINATA": data}, f)
 
     print("\n" + "="*40)
     print(f"SUKSES! Data tersimpan di: {filename}")
     print("="*40)
-    print(df)
+    for r in data:
+        print(r)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,67 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+# brotli hanya bisa di-decode kalau paket brotli / brotlicffi terpasang
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+POOL_CONNECTIONS = 8   # jumlah host yang pool-nya disimpan
+POOL_MAXSIZE = 8       # koneksi keep-alive per host (crawl paralel ke host yang sama)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _make_retry() -> Retry:
+    kwargs = dict(
+        total=3,
+        connect=3,
+        read=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        # urllib3 >= 2: jitter acak supaya retry dari beberapa crawler tidak barengan
+        return Retry(backoff_jitter=0.3, **kwargs)
+    except TypeError:
+        return Retry(**kwargs)
+
+
+def get_session() -> requests.Session:
+    """Session keep-alive bersama (pool koneksi per host + retry/backoff) untuk semua crawler."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                                      max_retries=_make_retry())
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["Accept-Encoding"] = ACCEPT_ENCODING
+                _session = s
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Pengganti requests.get(...) yang memakai session bersama."""
+    with metrics.span("fetch"):
+        resp = get_session().get(url, **kwargs)
+    # elapsed = sampai header diterima (DNS + TCP/TLS + server), sisanya dari span fetch = download body
+    metrics.observe("ttfb", resp.elapsed.total_seconds())
+    return resp
@@ -0,0 +1,165 @@
+"""
+Instrumentasi ringan tanpa dependency: span waktu per fase crawl + counter.
+
+    with metrics.span("fetch"):            # vendor diambil dari vendor_scope() yang aktif
+        ...
+    @metrics.timed("parse")
+    def parse_x(html): ...
+    metrics.inc("crawl_path_total", vendor="antam", path="regex")
+
+Fase: crawl, fetch, ttfb, render, render.goto, render.wait, browser_launch, parse, dedup, export.
+Dibaca lewat /metrics (format teks Prometheus) dan /debug/metrics (JSON).
+"""
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+PREFIX = "harga_emas"
+RECENT_SPANS = 200
+
+# vendor yang sedang di-crawl; ikut terbawa ke thread orchestrator / browser pool lewat copy_context()
+_vendor: contextvars.ContextVar = contextvars.ContextVar("metrics_vendor", default="-")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Summary:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[str, str], _Summary] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._recent: deque = deque(maxlen=RECENT_SPANS)
+        self.started = time.time()
+
+    def observe(self, phase: str, seconds: float, vendor: Optional[str] = None, error: bool = False) -> None:
+        vendor = vendor or _vendor.get()
+        with self._lock:
+            s = self._spans.get((vendor, phase))
+            if s is None:
+                s = self._spans[(vendor, phase)] = _Summary()
+            s.count += 1
+            s.total += seconds
+            s.max = max(s.max, seconds)
+            self._recent.append({"at": round(time.time(), 3), "vendor": vendor, "phase": phase,
+                                 "ms": round(seconds * 1000, 2), "error": error})
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Jumlah semua counter `name` yang label-nya cocok dengan `labels`."""
+        with self._lock:
+            return sum(v for (n, lk), v in self._counters.items()
+                       if n == name and all(dict(lk).get(k) == val for k, val in labels.items()))
+
+    def cache_hit_ratio(self) -> Optional[float]:
+        # stale ikut dihitung hit: request dilayani dari memory, refresh jalan di background
+        hits = self.counter("cache_requests_total", result="hit") + self.counter("cache_requests_total", result="stale")
+        total = self.counter("cache_requests_total")
+        return hits / total if total else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            spans = [{"vendor": v, "phase": p, "count": s.count, "total_ms": round(s.total * 1000, 2),
+                      "avg_ms": round(s.total / s.count * 1000, 2), "max_ms": round(s.max * 1000, 2)}
+                     for (v, p), s in sorted(self._spans.items())]
+            counters = [{"name": n, "labels": dict(lk), "value": v} for (n, lk), v in sorted(self._counters.items())]
+            recent = list(self._recent)
+        return {"uptime_s": round(time.time() - self.started, 1), "cache_hit_ratio": self.cache_hit_ratio(),
+                "spans": spans, "counters": counters, "recent": recent}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+
+        name = f"{PREFIX}_phase_seconds"
+        lines += [f"# HELP {name} Durasi fase crawl per vendor.", f"# TYPE {name} summary"]
+        for (vendor, phase), s in spans:
+            lab = _labels((("phase", phase), ("vendor", vendor)))
+            lines += [f"{name}_count{lab} {s.count}", f"{name}_sum{lab} {s.total:.6f}"]
+        lines += [f"# TYPE {name}_max gauge"]
+        lines += [f"{name}_max{_labels((('phase', p), ('vendor', v)))} {s.max:.6f}" for (v, p), s in spans]
+
+        seen = set()
+        for (cname, lk), v in counters:
+            full = f"{PREFIX}_{cname}"
+            if full not in seen:
+                seen.add(full)
+                lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full}{_labels(lk)} {v:g}")
+
+        ratio = self.cache_hit_ratio()
+        if ratio is not None:
+            lines += [f"# TYPE {PREFIX}_cache_hit_ratio gauge", f"{PREFIX}_cache_hit_ratio {ratio:.4f}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(items: LabelKey) -> str:
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+registry = Registry()
+observe = registry.observe
+inc = registry.inc
+
+
+@contextmanager
+def vendor_scope(vendor_id: str) -> Iterator[None]:
+    token = _vendor.set(vendor_id)
+    try:
+        yield
+    finally:
+        _vendor.reset(token)
+
+
+@contextmanager
+def span(phase: str, vendor: Optional[str] = None) -> Iterator[None]:
+    t = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        registry.observe(phase, time.perf_counter() - t, vendor, error)
+
+
+def timed(phase: str) -> Callable:
+    """Decorator: seluruh pemanggilan fungsi dicatat sebagai satu span `phase`."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
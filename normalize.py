@@ -0,0 +1,171 @@
+"""
+Normalisasi teks harga / gramasi / tanggal yang dipakai semua crawler (satu salinan).
+
+    clean_currency("Rp 1.420.000,00")            -> 1420000
+    clean_gram("0,5 gr")                         -> 0.5
+    gram_from_title("UBS Classic 0,5 Gram")      -> 0.5
+    parse_tanggal_update("Diperbarui Selasa, 27 Januari 2026") -> "2026-01-27"
+    clean_currency_many(["Rp 1.420.000", "-"])   -> Column(values=[1420000, 0], valid=[True, False])
+
+Format angka Indonesia: titik = ribuan, koma = desimal. Semua pola di-compile sekali;
+string yang sudah berupa angka bersih ("1420000") tidak lewat regex sama sekali.
+"""
+import math
+import numbers
+import re
+from datetime import date
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.7,en;q=0.6",
+}
+
+BULAN_ID = {
+    "januari": 1, "februari": 2, "maret": 3, "april": 4, "mei": 5, "juni": 6,
+    "juli": 7, "agustus": 8, "september": 9, "oktober": 10, "november": 11, "desember": 12
+}
+
+# nominal setelah "Rp" (teks sel kadang juga berisi gramasi: "1 gr Rp 1.420.000")
+RP_RE = re.compile(r"Rp\.?\s*(\d[\d.,]*)", re.IGNORECASE)
+NUMBER_RE = re.compile(r"\d[\d.,]*")
+GRAM_RE = re.compile(r"\d+(?:[.,]\d+)?")
+GRAM_UNIT_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:gram|gr)", re.IGNORECASE)
+TANGGAL_RE = re.compile(r"(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})")
+
+Text = Union[str, int, float, None]
+
+
+def today_iso() -> str:
+    return date.today().isoformat()
+
+
+def _currency(s: Text) -> Optional[int]:
+    if isinstance(s, str):
+        if s.isdigit() and s.isascii():
+            return int(s)
+        m = RP_RE.search(s)
+        num = m.group(1) if m else None
+        if num is None:
+            m = NUMBER_RE.search(s)
+            if not m:
+                return None
+            num = m.group(0)
+        num = num.rstrip(".,")
+        # ",00" / ".5" di ujung = sen, bukan ribuan (grup ribuan selalu 3 digit)
+        sep = max(num.rfind("."), num.rfind(","))
+        if sep >= 0 and len(num) - sep <= 3:
+            num = num[:sep]
+        return int(num.replace(".", "").replace(",", ""))
+    # angka dari JSON / DataFrame; bool & NaN bukan harga
+    if isinstance(s, numbers.Real) and not isinstance(s, bool) and math.isfinite(s):
+        return int(s)
+    return None
+
+
+def _gram(s: Text) -> Optional[float]:
+    if isinstance(s, str):
+        if s.isdigit() and s.isascii():
+            return float(s)
+        m = GRAM_RE.search(s)
+        return float(m.group(0).replace(",", ".")) if m else None
+    if isinstance(s, numbers.Real) and not isinstance(s, bool) and math.isfinite(s):
+        return float(s)
+    return None
+
+
+def clean_currency(s: Text) -> int:
+    """'Rp 1.420.000' / 'Rp1.420.000,00' / '1420000' -> 1420000 (0 kalau tidak ada angka)"""
+    v = _currency(s)
+    return 0 if v is None else v
+
+
+def clean_gram(s: Text) -> float:
+    """'0.1 gr' / '0,5\xa0Gram' / '1' -> float (0.0 kalau tidak ada angka)"""
+    v = _gram(s)
+    return 0.0 if v is None else v
+
+
+def gram_from_title(title: str) -> float:
+    """Gramasi dari judul produk: angka yang diikuti 'gram' / 'gr' ('UBS Classic 2024 0,5 Gram' -> 0.5)."""
+    if not title:
+        return 0.0
+    m = GRAM_UNIT_RE.search(title)
+    return float(m.group(1).replace(",", ".")) if m else 0.0
+
+
+def parse_tanggal_update(text: str) -> str:
+    """
+    Tanggal dari teks 'Diperbarui Selasa, 27 Januari 2026' -> '2026-01-27': kecocokan pertama
+    yang nama bulannya dikenal ("12 Item 2026" dilewati). Fallback hari ini.
+    """
+    for m in TANGGAL_RE.finditer(text or ""):
+        bulan = BULAN_ID.get(m.group(2).lower())
+        if bulan is None:
+            continue
+        try:
+            return date(int(m.group(3)), bulan, int(m.group(1))).isoformat()
+        except ValueError:
+            return today_iso()
+    return today_iso()
+
+
+# =========================
+# Normalisasi per kolom (batch)
+# =========================
+# di bawah ini loop biasa lebih murah dari import pandas + factorize
+BATCH_MIN = 512
+
+
+class Column(NamedTuple):
+    """Hasil normalisasi 1 kolom: nilai per sel (0 kalau tidak valid) + mask sel yang berisi angka."""
+    values: list
+    valid: List[bool]
+
+
+def _column_python(cells: Iterable, parse: Callable, empty) -> Column:
+    parsed = [parse(c) for c in cells]
+    return Column([empty if v is None else v for v in parsed], [v is not None for v in parsed])
+
+
+def _column(cells: Iterable, parse: Callable, empty, dtype: str) -> Column:
+    """
+    Kolom besar (snapshot arsip, backfill) isinya sangat berulang: gramasi yang sama, harga yang sama
+    di banyak halaman. pandas.factorize (hash di C) memetakan sel ke nilai unik, tiap string unik
+    di-parse sekali, lalu hasilnya disebar lagi lewat take() numpy.
+    """
+    if hasattr(cells, "to_pylist"):   # pyarrow Array / ChunkedArray: iterasinya pa.Scalar, bukan str / angka
+        cells = cells.to_pylist()
+    elif not hasattr(cells, "__len__"):
+        cells = list(cells)
+    if len(cells) < BATCH_MIN:
+        return _column_python(cells, parse, empty)
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        return _column_python(cells, parse, empty)
+
+    try:
+        # fromiter: sel berupa list (JSON) tidak dipecah jadi array 2D
+        codes, uniques = pd.factorize(np.fromiter(cells, dtype=object, count=len(cells)), use_na_sentinel=False)
+    except TypeError:   # sel tidak hashable (dict / list dari JSON)
+        return _column_python(cells, parse, empty)
+    parsed = [parse(u) for u in uniques]
+    try:
+        values = np.array([empty if v is None else v for v in parsed], dtype=dtype)
+    except OverflowError:   # angka > int64: biarkan jadi int Python
+        return _column_python(cells, parse, empty)
+    valid = np.array([v is not None for v in parsed], dtype=bool)
+    return Column(values.take(codes).tolist(), valid.take(codes).tolist())
+
+
+def clean_currency_many(cells: Iterable[Text]) -> Column:
+    """clean_currency untuk 1 kolom (list, pandas Series, array numpy / pyarrow): harga int64 + mask valid."""
+    return _column(cells, _currency, 0, "int64")
+
+
+def clean_gram_many(cells: Iterable[Text]) -> Column:
+    """clean_gram untuk 1 kolom: gramasi float64 + mask valid."""
+    return _column(cells, _gram, 0.0, "float64")
@@ -0,0 +1,83 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+DEFAULT_TIMEOUT = 120.0
+
+
+@dataclass
+class VendorResult:
+    name: str
+    status: str                 # "ok" | "error" | "timeout"
+    data: Any = None            # hasil crawler (None kalau gagal / timeout)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def _run(fn: Callable[[], Any], fut: Future) -> None:
+    try:
+        fut.set_result(fn())
+    except BaseException as e:
+        fut.set_exception(e)
+
+
+def iter_crawl(tasks: Dict[str, Callable[[], Any]],
+               timeout: Union[float, Dict[str, float]] = DEFAULT_TIMEOUT) -> Iterator[VendorResult]:
+    """
+    Jalankan semua crawler sekaligus (1 thread per vendor) dan yield hasilnya
+    sesuai urutan selesai. Vendor yang melewati batas waktunya di-yield sebagai
+    status "timeout"; thread-nya dibiarkan jalan (daemon) tapi tidak ditunggu.
+    """
+    start = time.monotonic()
+    pending: Dict[Future, str] = {}
+    deadlines: Dict[str, float] = {}
+
+    for name, fn in tasks.items():
+        fut = Future()
+        # daemon thread: crawler yang hang tidak menahan proses saat exit.
+        # copy_context: label vendor untuk metrics ikut ke thread crawler
+        ctx = contextvars.copy_context()
+        threading.Thread(target=ctx.run, args=(_run, fn, fut), name=f"crawl-{name}", daemon=True).start()
+        pending[fut] = name
+        t = timeout.get(name, DEFAULT_TIMEOUT) if isinstance(timeout, dict) else timeout
+        deadlines[name] = start + t
+
+    while pending:
+        now = time.monotonic()
+        next_deadline = min(deadlines[n] for n in pending.values())
+        done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+
+        for fut in done:
+            name = pending.pop(fut)
+            exc = fut.exception()
+            if exc is None:
+                yield VendorResult(name, "ok", data=fut.result(), elapsed=now - start)
+            else:
+                yield VendorResult(name, "error", error=str(exc), elapsed=now - start)
+
+        for fut, name in list(pending.items()):
+            if now >= deadlines[name]:
+                pending.pop(fut)
+                yield VendorResult(name, "timeout", error=f"melebihi {deadlines[name] - start:.1f} detik",
+                                   elapsed=now - start)
+
+
+def crawl_all(tasks: Dict[str, Callable[[], Any]],
+              timeout: Union[float, Dict[str, float]] = DEFAULT_TIMEOUT) -> Dict[str, VendorResult]:
+    """Versi blocking dari iter_crawl: return dict {nama: VendorResult} setelah semua selesai / timeout."""
+    results = {}
+    for res in iter_crawl(tasks, timeout):
+        if res.ok:
+            print(f"[CRAWL] {res.name}: OK ({res.elapsed:.1f}s)")
+        else:
+            print(f"[CRAWL] {res.name}: {res.status.upper()} ({res.elapsed:.1f}s) {res.error}")
+        results[res.name] = res
+    return results
@@ -0,0 +1,35 @@
+import os
+import re
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# Backend parser: lxml (C, jauh lebih cepat) kalau terpasang, fallback ke html.parser bawaan Python.
+# Bisa dipaksa lewat env HTML_PARSER=html.parser / lxml.
+try:
+    import lxml  # noqa: F401
+    _DEFAULT_PARSER = "lxml"
+except ImportError:
+    _DEFAULT_PARSER = "html.parser"
+
+PARSER = os.environ.get("HTML_PARSER", _DEFAULT_PARSER)
+
+# Strainer: hanya subtree ini yang dibangun jadi tree, sisanya (script, menu, footer) dilewati
+STRAIN_TABLE = SoupStrainer("table")
+STRAIN_HRTA_TABLE = SoupStrainer("table", attrs={"data-slot": "table"})
+STRAIN_G24 = SoupStrainer("div", id="GALERI 24")
+# class multi-value ("as-producttile foo") tidak cocok dengan class_="..." di SoupStrainer -> pakai regex
+STRAIN_UBS_TILES = SoupStrainer("div", attrs={"class": re.compile(r"\bas-producttile\b")})
+
+Document = Union[str, bytes, BeautifulSoup, Tag]
+
+
+def make_soup(html: Union[str, bytes], parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html or "", PARSER, parse_only=parse_only)
+
+
+def as_soup(doc: Document, parse_only: Optional[SoupStrainer] = None) -> Union[BeautifulSoup, Tag]:
+    """Terima HTML mentah atau soup yang sudah jadi; soup dipakai ulang tanpa parse ulang."""
+    if isinstance(doc, Tag):
+        return doc
+    return make_soup(doc, parse_only)
@@ -0,0 +1,76 @@
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Nama kolom di API / Excel / CSV (urutan tetap)
+COLUMNS = ("Vendor", "Tanggal", "Gramasi", "Harga Beli", "Harga Buyback")
+_ATTRS = {"Vendor": "vendor", "Tanggal": "tanggal", "Gramasi": "gramasi",
+          "Harga Beli": "harga_beli", "Harga Buyback": "harga_buyback"}
+
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+class PriceRow:
+    """
+    Satu baris harga hasil crawler, divalidasi saat dibuat (ValueError kalau tidak valid).
+    Sort, dedup, store & export langsung memakai objek ini; dict / JSON hanya dibuat di tepi
+    (response API) lewat as_dict() / json_default.
+    """
+    __slots__ = ("vendor", "tanggal", "gramasi", "harga_beli", "harga_buyback")
+
+    def __init__(self, vendor: str, tanggal: str, gramasi: float, harga_beli: int, harga_buyback: int = 0):
+        if not vendor:
+            raise ValueError("Vendor kosong")
+        if not ISO_DATE_RE.match(tanggal or ""):
+            raise ValueError(f"Tanggal bukan YYYY-MM-DD: {tanggal!r}")
+        gramasi = float(gramasi)
+        if not gramasi > 0:
+            raise ValueError(f"Gramasi harus > 0: {gramasi!r}")
+        harga_beli = int(harga_beli or 0)
+        harga_buyback = int(harga_buyback or 0)
+        if harga_beli < 0 or harga_buyback < 0:
+            raise ValueError(f"Harga negatif: {harga_beli} / {harga_buyback}")
+        self.vendor = vendor
+        self.tanggal = tanggal
+        self.gramasi = gramasi
+        self.harga_beli = harga_beli
+        self.harga_buyback = harga_buyback
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PriceRow":
+        return cls(d["Vendor"], d["Tanggal"], d["Gramasi"], d["Harga Beli"], d.get("Harga Buyback", 0))
+
+    def as_tuple(self) -> Tuple:
+        return (self.vendor, self.tanggal, self.gramasi, self.harga_beli, self.harga_buyback)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(COLUMNS, self.as_tuple()))
+
+    # akses baca per nama kolom (r["Gramasi"], r.get("Harga Beli")) untuk kode yang bekerja per kolom
+    def __getitem__(self, column: str) -> Any:
+        return getattr(self, _ATTRS[column])
+
+    def get(self, column: str, default: Any = None) -> Any:
+        attr = _ATTRS.get(column)
+        return getattr(self, attr) if attr else default
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PriceRow) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return (f"PriceRow({self.vendor!r}, {self.tanggal!r}, {self.gramasi:g} g, "
+                f"beli={self.harga_beli}, buyback={self.harga_buyback})")
+
+
+def sort_rows(rows: Iterable[PriceRow]) -> List[PriceRow]:
+    """Urutan standar export gabungan: per vendor, lalu gramasi."""
+    return sorted(rows, key=lambda r: (r.vendor, r.gramasi))
+
+
+def json_default(obj: Any) -> Any:
+    """Hook `default=` untuk json.dumps / JSON provider Flask."""
+    if isinstance(obj, PriceRow):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,65 @@
+import gzip
+import hashlib
+import json
+from typing import Any, List, Sequence, Union
+
+from flask import Response, request
+
+from records import COLUMNS, PriceRow, json_default
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HOISTED = ("Vendor", "Tanggal")
+MIN_COMPRESS = 512   # byte; body kecil tidak sebanding dengan overhead kompresi
+
+
+def compact_rows(rows: List[Union[PriceRow, dict]], columns: Sequence[str] = COLUMNS) -> dict:
+    """
+    Format kolom: {"Vendor": "ANTAM", "Tanggal": "2026-01-27", "Gramasi": [...], "Harga Beli": [...], ...}
+    Vendor / Tanggal jadi 1 nilai kalau sama untuk semua baris, selain itu tetap list per baris
+    (mis. Hartadinata yang punya beberapa kategori). columns: kolom tambahan untuk baris dict
+    (riwayat: + "Waktu Crawl").
+    """
+    out: dict = {"n": len(rows)}
+    for col in columns:
+        values = [r[col] for r in rows]
+        if col in HOISTED and values and all(v == values[0] for v in values):
+            out[col] = values[0]
+        else:
+            out[col] = values
+    return out
+
+
+def wants_compact() -> bool:
+    return request.args.get("format") == "compact"
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """
+    JSON ringkas + ETag hash isi + kompresi br/gzip sesuai Accept-Encoding.
+    If-None-Match yang cocok -> 304 tanpa body. Cache-Control no-cache: browser boleh simpan,
+    tapi wajib revalidasi (dapat 304 kalau harga belum bergerak).
+    """
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=json_default).encode("utf-8")
+    # weak ETag: representasi gzip/br/identity dari isi yang sama dianggap setara
+    etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+
+    if status == 200 and etag in request.headers.get("If-None-Match", ""):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, status=status, mimetype="application/json")
+        accept = request.headers.get("Accept-Encoding", "")
+        if len(body) >= MIN_COMPRESS:
+            if brotli is not None and "br" in accept:
+                resp.set_data(brotli.compress(body, quality=5))
+                resp.headers["Content-Encoding"] = "br"
+            elif "gzip" in accept:
+                resp.set_data(gzip.compress(body, compresslevel=6))
+                resp.headers["Content-Encoding"] = "gzip"
+    resp.headers["ETag"] = etag
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
@@ -0,0 +1,21 @@
+from typing import Iterable, List, Optional
+
+
+class CrawlResult(list):
+    """
+    List baris harga hasil crawler + metadata crawl.
+    Tetap sebuah list, jadi pemanggil lama (jsonify, pandas, len, loop) tidak berubah.
+
+    missing: sumber data yang gagal diambil (mis. ["buyback"]) -> hasilnya parsial
+    unchanged_since: halaman vendor tidak berubah sejak waktu ini (ISO); baris = hasil parse lama
+    """
+
+    def __init__(self, rows: Iterable = (), missing: Optional[List[str]] = None,
+                 unchanged_since: Optional[str] = None):
+        super().__init__(rows)
+        self.missing = list(missing or [])
+        self.unchanged_since = unchanged_since
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
@@ -0,0 +1,119 @@
+"""
+Scheduler crawl di background: tiap vendor di-crawl ulang sesuai jadwalnya sendiri
+dan hasilnya dipublikasikan ke cache (kalau jalan di dalam app) + price store,
+jadi request API cukup membaca memory / store tanpa menunggu scrape.
+
+    python scheduler.py                   # worker terpisah, semua vendor
+    python scheduler.py --vendors antam   # sebagian vendor
+    python scheduler.py --once            # satu putaran lalu keluar (cron)
+
+Di dalam Flask app: set PRICE_SCHEDULER=1.
+"""
+import argparse
+import os
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from orchestrator import VendorResult, crawl_all
+from store import get_store
+from vendors import OFF_HOURS_FACTOR, VENDORS, Vendor
+
+WIB = timezone(timedelta(hours=7))
+
+# jam harga vendor biasanya diperbarui (WIB), format "7-18"
+MARKET_HOURS = tuple(int(h) for h in os.environ.get("SCHED_MARKET_HOURS", "7-18").split("-"))
+MAX_BACKOFF = float(os.environ.get("SCHED_MAX_BACKOFF", "3600"))         # batas backoff setelah gagal beruntun
+
+
+def in_market_hours(now: Optional[datetime] = None) -> bool:
+    now = now or datetime.now(WIB)
+    return MARKET_HOURS[0] <= now.astimezone(WIB).hour < MARKET_HOURS[1]
+
+
+def next_delay(vendor: Vendor, failures: int = 0, now: Optional[datetime] = None) -> float:
+    """Detik sampai crawl berikutnya: vendor.refresh (x faktor di luar jam pasar), backoff eksponensial kalau gagal."""
+    delay = vendor.refresh if in_market_hours(now) else vendor.refresh * OFF_HOURS_FACTOR
+    if failures:
+        delay = min(delay * 2 ** failures, max(MAX_BACKOFF, delay))
+    # jitter +-10% supaya vendor dengan interval sama tidak selalu barengan
+    return delay * random.uniform(0.9, 1.1)
+
+
+class Scheduler:
+    """1 thread loop per vendor; cache opsional (PriceCache milik app)."""
+
+    def __init__(self, vendor_ids: Optional[Iterable[str]] = None, cache=None):
+        self.vendors = [VENDORS[i] for i in (vendor_ids or VENDORS)]
+        self.cache = cache
+        self._stop = threading.Event()
+        self._threads = []
+
+    def run_once(self, vendor: Vendor) -> VendorResult:
+        res = crawl_all({vendor.id: vendor.crawl}, timeout={vendor.id: vendor.timeout})[vendor.id]
+        return self.publish(vendor, res)
+
+    def publish(self, vendor: Vendor, res: VendorResult) -> VendorResult:
+        if res.ok and not res.data:
+            res = VendorResult(vendor.id, "error", error="tidak ada data", elapsed=res.elapsed)
+        # baris sudah ditulis ke store oleh vendor.crawl(); di sini cukup catat status pengecekan
+        try:
+            get_store().mark_checked(vendor.id, res.status, res.error)
+        except Exception as e:
+            print(f"[SCHED] gagal catat status {vendor.id}: {e}")
+        if res.ok and self.cache is not None:
+            self.cache.set(vendor.id, res.data, ttl=vendor.scheduled_ttl())
+        return res
+
+    def _loop(self, vendor: Vendor) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                ok = self.run_once(vendor).ok
+            except Exception as e:
+                print(f"[SCHED] {vendor.id}: {e}")
+                ok = False
+            failures = 0 if ok else failures + 1
+            delay = next_delay(vendor, failures)
+            print(f"[SCHED] {vendor.id}: berikutnya dalam {delay:.0f}s" + (f" (gagal {failures}x)" if failures else ""))
+            self._stop.wait(delay)
+
+    def start(self) -> "Scheduler":
+        for v in self.vendors:
+            t = threading.Thread(target=self._loop, args=(v,), name=f"sched-{v.id}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self) -> None:
+        for t in self._threads:
+            t.join()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--vendors", nargs="*", choices=sorted(VENDORS), help="default: semua vendor")
+    ap.add_argument("--once", action="store_true", help="crawl semua vendor sekali lalu keluar")
+    args = ap.parse_args()
+
+    sched = Scheduler(args.vendors)
+    if args.once:
+        results = crawl_all({v.id: v.crawl for v in sched.vendors}, timeout={v.id: v.timeout for v in sched.vendors})
+        for v in sched.vendors:
+            sched.publish(v, results[v.id])
+        return
+
+    print(f"[SCHED] start: {', '.join(v.id for v in sched.vendors)} (jam pasar {MARKET_HOURS[0]}-{MARKET_HOURS[1]} WIB)")
+    sched.start()
+    try:
+        sched.join()
+    except KeyboardInterrupt:
+        sched.stop()
+
+
+if __name__ == "__main__":
+    main()
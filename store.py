@@ -0,0 +1,251 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, List, Optional
+
+import analytics
+from records import PriceRow
+
+# Vercel: filesystem read-only kecuali /tmp
+_DEFAULT_DB = os.path.join("/tmp", "harga_emas.db") if os.environ.get("VERCEL") else "harga_emas.db"
+DB_PATH = os.environ.get("PRICE_DB_PATH", _DEFAULT_DB)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    vendor_id     TEXT    NOT NULL,   -- id registry: antam / g24 / hrta / ubs
+    vendor        TEXT    NOT NULL,   -- label baris, mis. 'HARTADINATA (Emas Batangan)'
+    gram          REAL    NOT NULL,
+    tanggal       TEXT    NOT NULL,   -- tanggal harga versi vendor (YYYY-MM-DD)
+    crawled_at    TEXT    NOT NULL,   -- waktu crawl (ISO, waktu lokal)
+    harga_beli    INTEGER NOT NULL,
+    harga_buyback INTEGER NOT NULL,
+    -- tanggal ikut key: 1 arsip (crawled_at sama) bisa memuat harga beberapa tanggal
+    PRIMARY KEY (vendor_id, vendor, gram, tanggal, crawled_at)
+);
+CREATE INDEX IF NOT EXISTS idx_prices_vendor_gram_time ON prices (vendor_id, gram, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_prices_time ON prices (crawled_at);
+-- backfill: cek "sudah ada harga vendor+gram di tanggal ini"
+CREATE INDEX IF NOT EXISTS idx_prices_day ON prices (vendor_id, vendor, gram, tanggal);
+-- metrik turunan per (gram, tanggal, vendor), diisi saat save / bulk_load (lihat analytics.py);
+-- 1 baris per vendor per hari: crawl terakhir hari itu
+CREATE TABLE IF NOT EXISTS price_stats (
+    gram           REAL    NOT NULL,
+    tanggal        TEXT    NOT NULL,
+    vendor_id      TEXT    NOT NULL,
+    vendor         TEXT    NOT NULL,
+    crawled_at     TEXT    NOT NULL,
+    harga_beli     INTEGER NOT NULL,
+    harga_buyback  INTEGER NOT NULL,
+    price_per_gram REAL,
+    spread_pct     REAL,
+    PRIMARY KEY (gram, tanggal, vendor_id, vendor)
+) WITHOUT ROWID;
+-- pengecekan terakhir oleh scheduler; crawl "unchanged" tidak menulis baris baru ke prices
+CREATE TABLE IF NOT EXISTS crawl_status (
+    vendor_id  TEXT PRIMARY KEY,
+    checked_at TEXT NOT NULL,
+    status     TEXT NOT NULL,   -- ok / error / timeout
+    error      TEXT
+);
+"""
+
+COLUMNS = "vendor_id, vendor, gram, tanggal, crawled_at, harga_beli, harga_buyback"
+BULK_BATCH = 50_000   # baris per transaksi saat bulk load
+STATS_COLUMNS = "gram, tanggal, vendor_id, vendor, crawled_at, harga_beli, harga_buyback, price_per_gram, spread_pct"
+_STATS_NAMES = [c.strip() for c in STATS_COLUMNS.split(",")]
+# baris arsip yang lebih tua dari isi index tidak menimpa crawl terbaru hari itu
+STATS_UPSERT = (
+    f"INSERT INTO price_stats ({STATS_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (gram, tanggal, vendor_id, vendor) DO UPDATE SET crawled_at = excluded.crawled_at, "
+    "harga_beli = excluded.harga_beli, harga_buyback = excluded.harga_buyback, "
+    "price_per_gram = excluded.price_per_gram, spread_pct = excluded.spread_pct "
+    "WHERE excluded.crawled_at >= price_stats.crawled_at"
+)
+
+
+def _row_to_dict(r) -> dict:
+    return {
+        "Vendor": r[1],
+        "Tanggal": r[3],
+        "Gramasi": r[2],
+        "Harga Beli": r[5],
+        "Harga Buyback": r[6],
+        "Waktu Crawl": r[4],
+    }
+
+
+def _bound(value: Optional[str], upper: bool) -> Optional[str]:
+    """
+    Batas rentang waktu crawl (ValueError kalau bukan tanggal / waktu ISO). '2026-01-27' sebagai
+    batas atas berarti sampai akhir hari itu (eksklusif hari berikutnya).
+    """
+    if not value:
+        return None
+    if len(value) == 10:
+        day = date.fromisoformat(value)
+        return (day + timedelta(days=1)).isoformat() if upper else day.isoformat()
+    # format sama dengan crawled_at ('T', bukan spasi) supaya perbandingan string benar
+    return datetime.fromisoformat(value).isoformat()
+
+
+class PriceStore:
+    """Riwayat harga di SQLite: 1 baris per (vendor, gram, tanggal, waktu crawl)."""
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def save(self, vendor_id: str, rows: Iterable[PriceRow], crawled_at: Optional[str] = None) -> int:
+        crawled_at = crawled_at or datetime.now().isoformat(timespec="seconds")
+        params = [
+            (vendor_id, r.vendor, r.gramasi, r.tanggal, crawled_at, r.harga_beli, r.harga_buyback)
+            for r in rows
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO prices ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", params)
+            self._conn.executemany(STATS_UPSERT, analytics.stats_params(params))
+        return len(params)
+
+    def bulk_load(self, rows: Iterable[tuple], batch: int = BULK_BATCH) -> int:
+        """
+        Import riwayat (backfill). rows: tuple urut COLUMNS. Baris yang (vendor_id, vendor, gram, tanggal)-nya
+        sudah ada di store dilewati, jadi import ulang / tumpang tindih dengan crawl live aman.
+        Ditulis per `batch` baris dalam 1 transaksi. Return jumlah baris baru.
+        """
+        # ?1..?4 memakai ulang 4 parameter pertama (vendor_id, vendor, gram, tanggal)
+        sql = (f"INSERT INTO prices ({COLUMNS}) SELECT ?, ?, ?, ?, ?, ?, ? WHERE NOT EXISTS "
+               "(SELECT 1 FROM prices WHERE vendor_id = ?1 AND vendor = ?2 AND gram = ?3 AND tanggal = ?4)")
+        chunk: list = []
+        with self._lock:
+            inserted = 0
+            for r in rows:
+                chunk.append(r)
+                if len(chunk) >= batch:
+                    inserted += self._bulk_chunk(sql, chunk)
+                    chunk = []
+            if chunk:
+                inserted += self._bulk_chunk(sql, chunk)
+            return inserted
+
+    def _bulk_chunk(self, sql: str, chunk: list) -> int:
+        with self._conn:
+            # per baris (bukan executemany) supaya price_stats hanya diisi dari baris yang benar-benar masuk
+            inserted = [r for r in chunk if self._conn.execute(sql, r).rowcount]
+            self._conn.executemany(STATS_UPSERT, analytics.stats_params(inserted))
+        return len(inserted)
+
+    def gram_stats(self, gram: float, tanggal: Optional[str] = None, window_days: int = analytics.BEST_WINDOW_DAYS) -> List[dict]:
+        """
+        Baris price_stats 1 gramasi, termurah dulu. Dengan tanggal: hari itu saja;
+        tanpa tanggal: tanggal terakhir tiap vendor (vendor tidak selalu update di hari yang sama),
+        asal tidak lebih dari window_days hari sebelum tanggal terbaru gramasi ini. Vendor yang
+        berhari-hari gagal crawl / kategori yang sudah tidak dijual tidak ikut lagi.
+        """
+        if tanggal is not None:
+            date.fromisoformat(tanggal)   # ValueError kalau bukan YYYY-MM-DD
+            sql = f"SELECT {STATS_COLUMNS} FROM price_stats WHERE gram = ? AND tanggal = ?"
+            args: list = [float(gram), tanggal]
+        else:
+            sql = (f"SELECT {STATS_COLUMNS} FROM price_stats s WHERE gram = ? AND tanggal = "
+                   "(SELECT MAX(tanggal) FROM price_stats WHERE gram = s.gram AND vendor_id = s.vendor_id "
+                   "AND vendor = s.vendor) AND tanggal >= "
+                   "date((SELECT MAX(tanggal) FROM price_stats WHERE gram = s.gram), ?)")
+            args = [float(gram), f"-{int(window_days)} days"]
+        sql += " ORDER BY harga_beli = 0, harga_beli, vendor"
+        with self._lock:
+            return [dict(zip(_STATS_NAMES, r)) for r in self._conn.execute(sql, args)]
+
+    def _history_query(self, vendor_id, gram, start, end, limit):
+        sql = f"SELECT {COLUMNS} FROM prices WHERE vendor_id = ?"
+        args: list = [vendor_id]
+        if gram is not None:
+            sql += " AND gram = ?"
+            args.append(float(gram))
+        if start:
+            sql += " AND crawled_at >= ?"
+            args.append(_bound(start, upper=False))
+        if end:
+            # tanggal saja: eksklusif hari berikutnya; waktu lengkap: inklusif (crawl tepat di batas ikut)
+            sql += " AND crawled_at < ?" if len(end) == 10 else " AND crawled_at <= ?"
+            args.append(_bound(end, upper=True))
+        sql += " ORDER BY crawled_at, vendor, gram"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return sql, args
+
+    def history(self, vendor_id: str, gram: Optional[float] = None, start: Optional[str] = None,
+                end: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        sql, args = self._history_query(vendor_id, gram, start, end, limit)
+        with self._lock:
+            return [_row_to_dict(r) for r in self._conn.execute(sql, args)]
+
+    def iter_history(self, vendor_id: str, gram: Optional[float] = None, start: Optional[str] = None,
+                     end: Optional[str] = None, batch: int = 1000) -> Iterator[dict]:
+        """
+        Seperti history(), tapi baris dibaca bertahap lewat koneksi sendiri (WAL: tidak memblokir
+        writer), jadi export rentang panjang tidak perlu memuat semuanya ke memory.
+        """
+        # query dibangun di sini (bukan di generator) supaya parameter salah langsung ValueError
+        sql, args = self._history_query(vendor_id, gram, start, end, None)
+        return self._iter_query(sql, args, batch)
+
+    def _iter_query(self, sql: str, args: list, batch: int) -> Iterator[dict]:
+        conn = sqlite3.connect(self.path)
+        try:
+            cur = conn.execute(sql, args)
+            while True:
+                chunk = cur.fetchmany(batch)
+                if not chunk:
+                    break
+                for r in chunk:
+                    yield _row_to_dict(r)
+        finally:
+            conn.close()
+
+    def latest(self, vendor_id: str) -> List[dict]:
+        """Snapshot crawl terakhir suatu vendor."""
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {COLUMNS} FROM prices WHERE vendor_id = ? AND crawled_at = "
+                "(SELECT MAX(crawled_at) FROM prices WHERE vendor_id = ?) ORDER BY vendor, gram",
+                (vendor_id, vendor_id))
+            return [_row_to_dict(r) for r in cur]
+
+    def mark_checked(self, vendor_id: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_status (vendor_id, checked_at, status, error) VALUES (?, ?, ?, ?)",
+                (vendor_id, datetime.now().isoformat(timespec="seconds"), status, error))
+
+    def snapshot(self, vendor_id: str, max_age: float) -> Optional[List[PriceRow]]:
+        """
+        Snapshot terakhir (PriceRow, seperti hasil crawler) kalau scheduler sukses mengecek
+        vendor ini kurang dari max_age detik lalu; selain itu None.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT checked_at, status FROM crawl_status WHERE vendor_id = ?",
+                                     (vendor_id,)).fetchone()
+        if row is None or row[1] != "ok":
+            return None
+        if (datetime.now() - datetime.fromisoformat(row[0])).total_seconds() > max_age:
+            return None
+        return [PriceRow.from_dict(r) for r in self.latest(vendor_id)] or None
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PriceStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
@@ -1,156 +1,147 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
-import re
 import urllib3
 
+import http_client
+import metrics
+from export import write_xlsx
+from normalize import HEADERS, clean_currency_many, clean_gram_many, gram_from_title, today_iso
+from parsing import STRAIN_TABLE, STRAIN_UBS_TILES, make_soup
+from orchestrator import crawl_all
+from records import PriceRow
+from result import CrawlResult
+
 # Disable warning SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-}
-
-def clean_currency(price_str):
-    """Mengubah format 'Rp 1.724.700' menjadi integer 1724700"""
-    if not price_str: return 0
-    clean_str = re.sub(r'[^\d]', '', str(price_str))
-    return int(clean_str) if clean_str else 0
-
-def clean_gram_from_title(title):
-    """Ekstrak angka gram dari judul produk katalog."""
-    if not title: return 0.0
-    match = re.search(r'(\d+(?:[.,]\d+)?)\s*(?:gram|gr)', title.lower())
-    if match:
-        num_str = match.group(1).replace(',', '.')
-        return float(num_str)
-    return 0.0
-
-def clean_gram_simple(gram_str):
-    """Membersihkan format '0,5 Gram' dari tabel menjadi 0.5 (float)"""
-    if not gram_str: return 0.0
-    # Ambil angka saja, buang teks "Gram" dan whitespace
-    clean = re.sub(r'[^\d,.]', '', str(gram_str)).replace(',', '.')
-    try:
-        return float(clean)
-    except:
-        return 0.0
+URL_CATALOG = "https://ubslifestyle.com/products/?s=classic"
+URL_BUYBACK = "https://ubslifestyle.com/harga-buyback-hari-ini/"
+
+@metrics.timed('parse')
+def parse_catalog(html):
+    """Harga jual dari halaman katalog search -> {gram: harga_beli}"""
+    soup = make_soup(html, STRAIN_UBS_TILES)
 
-def crawl_ubs_complete():
-    print("=== MULAI CRAWLING UBS LIFESTYLE (FIXED BUYBACK) ===")
-    
-    # --- STEP 1: AMBIL HARGA JUAL (Dari Katalog Search) ---
-    url_catalog = "https://ubslifestyle.com/products/?s=classic"
-    print(f"[1/2] Mengambil Katalog Harga Beli dari: {url_catalog}...")
-    
     catalog_data = {} # Dictionary {gram: harga_beli}
-    
-    try:
-        response = requests.get(url_catalog, headers=HEADERS, verify=False, timeout=30)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        product_cards = soup.find_all('div', class_='as-producttile')
-        
-        for card in product_cards:
-            title_tag = card.find('h3', class_='as-producttile-name')
-            if not title_tag: continue
-            
-            title_text = title_tag.get_text(strip=True)
-            gram = clean_gram_from_title(title_text)
-            
-            if gram == 0: continue 
-            
-            price_tag = card.find('span', class_='woocommerce-Price-amount')
-            if price_tag:
-                price = clean_currency(price_tag.get_text())
-                catalog_data[gram] = price
-                print(f"   -> Katalog: {gram}g = Rp {price:,}")
-                
-    except Exception as e:
-        print(f"   [Error Catalog] {e}")
-
-    # --- STEP 2: AMBIL HARGA BUYBACK (Dari Link Buyback Khusus) ---
-    url_buyback = "https://ubslifestyle.com/harga-buyback-hari-ini/"
-    print(f"\n[2/2] Mengambil Daftar Buyback dari: {url_buyback}...")
-    
+    product_cards = soup.find_all('div', class_='as-producttile')
+
+    grams, price_txts = [], []
+    for card in product_cards:
+        title_tag = card.find('h3', class_='as-producttile-name')
+        if not title_tag: continue
+
+        gram = gram_from_title(title_tag.get_text(strip=True))
+        if gram == 0: continue
+
+        price_tag = card.find('span', class_='woocommerce-Price-amount')
+        if price_tag:
+            grams.append(gram)
+            price_txts.append(price_tag.get_text())
+
+    for gram, price in zip(grams, clean_currency_many(price_txts).values):
+        catalog_data[gram] = price
+        print(f"   -> Katalog: {gram}g = Rp {price:,}")
+
+    return catalog_data
+
+@metrics.timed('parse')
+def parse_buyback(html):
+    """Harga buyback dari halaman buyback khusus -> {gram: harga_buyback}"""
+    soup = make_soup(html, STRAIN_TABLE)
+
     buyback_data = {} # Dictionary {gram: harga_buyback}
-    
-    try:
-        response = requests.get(url_buyback, headers=HEADERS, verify=False, timeout=30)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Cari tabel (biasanya tabel pertama atau yang punya class 'table-price')
-        table = soup.find('table')
-        
-        if table:
-            # Cari body tabel
-            tbody = table.find('tbody')
-            if tbody:
-                rows = tbody.find_all('tr')
-            else:
-                rows = table.find_all('tr')
-
-            for row in rows:
-                cols = row.find_all('td')
-                
-                # PERBAIKAN DI SINI:
-                # Kolom 0 = Gramasi
-                # Kolom 1 = Harga Beli
-                # Kolom 2 = Harga Buyback (Target Kita)
-                if len(cols) >= 3: 
-                    gram_txt = cols[0].get_text(strip=True)     # "0.05 Gram"
-                    # price_beli_txt = cols[1].get_text(strip=True) 
-                    buyback_txt = cols[2].get_text(strip=True)  # "Rp136.000"
-                    
-                    gram = clean_gram_simple(gram_txt)
-                    price_bb = clean_currency(buyback_txt)
-                    
-                    if gram > 0:
-                        buyback_data[gram] = price_bb
-                        # print(f"      Debug: {gram}g -> Buyback Rp {price_bb:,}") # Uncomment utk debug
-                        
-        print(f"   -> Berhasil ambil {len(buyback_data)} data harga buyback.")
-        
-    except Exception as e:
-        print(f"   [Error Buyback] {e}")
 
-    # --- STEP 3: GABUNGKAN DATA (MERGE) ---
-    print("\n[3/3] Menggabungkan Data...")
+    # Cari tabel (biasanya tabel pertama atau yang punya class 'table-price')
+    table = soup.find('table')
+
+    if table:
+        # Cari body tabel
+        tbody = table.find('tbody')
+        if tbody:
+            rows = tbody.find_all('tr')
+        else:
+            rows = table.find_all('tr')
+
+        gram_txts, buyback_txts = [], []
+        for row in rows:
+            cols = row.find_all('td')
+
+            # Kolom 0 = Gramasi
+            # Kolom 1 = Harga Beli
+            # Kolom 2 = Harga Buyback (Target Kita)
+            if len(cols) >= 3:
+                gram_txts.append(cols[0].get_text(strip=True))     # "0.05 Gram"
+                buyback_txts.append(cols[2].get_text(strip=True))  # "Rp136.000"
+
+        for gram, price_bb in zip(clean_gram_many(gram_txts).values, clean_currency_many(buyback_txts).values):
+            if gram > 0:
+                buyback_data[gram] = price_bb
+
+    return buyback_data
+
+def fetch_catalog():
+    print(f"[1/2] Mengambil Katalog Harga Beli dari: {URL_CATALOG}...")
+    response = http_client.get(URL_CATALOG, headers=HEADERS, verify=False, timeout=30)
+    response.raise_for_status()
+    return parse_catalog(response.content)
+
+def fetch_buyback():
+    print(f"[2/2] Mengambil Daftar Buyback dari: {URL_BUYBACK}...")
+    response = http_client.get(URL_BUYBACK, headers=HEADERS, verify=False, timeout=30)
+    response.raise_for_status()
+    buyback_data = parse_buyback(response.content)
+    print(f"   -> Berhasil ambil {len(buyback_data)} data harga buyback.")
+    return buyback_data
+
+def merge_ubs(catalog_data, buyback_data, missing):
+    """
+    Gabungkan katalog + buyback per gram.
+    Katalog jadi acuan utama; kalau katalog gagal, gramasi diambil dari tabel buyback.
+    """
+    tanggal = today_iso()
+    base = catalog_data if catalog_data else buyback_data
+
     final_list = []
-    
-    # Gunakan data gramasi dari Katalog sebagai acuan utama
-    sorted_grams = sorted(catalog_data.keys())
-    
-    for gram in sorted_grams:
-        harga_beli = catalog_data[gram]
-        
+    for gram in sorted(base.keys()):
         # Cari pasangan buyback-nya. Kalau tidak ada, set 0
-        harga_buyback = buyback_data.get(gram, 0)
-        
-        final_list.append({
-            'Vendor': 'UBS LIFESTYLE',
-            'Tanggal': datetime.now().strftime('%Y-%m-%d'),
-            'Gramasi': gram,
-            'Harga Beli': harga_beli,
-            'Harga Buyback': harga_buyback
-        })
-        
-    return final_list
+        final_list.append(PriceRow('UBS LIFESTYLE', tanggal, gram,
+                                   catalog_data.get(gram, 0), buyback_data.get(gram, 0)))
+
+    return CrawlResult(final_list, missing=missing)
+
+def parse_page(html):
+    """Parse satu halaman UBS tersimpan (katalog atau buyback); sisi lainnya ditandai missing."""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    if 'as-producttile' in html:
+        return merge_ubs(parse_catalog(html), {}, ['buyback'])
+    return merge_ubs({}, parse_buyback(html), ['catalog'])
+
+def crawl_ubs_complete():
+    print("=== MULAI CRAWLING UBS LIFESTYLE (FIXED BUYBACK) ===")
+
+    # katalog & buyback diambil bersamaan, lalu di-parse masing-masing
+    results = crawl_all({'catalog': fetch_catalog, 'buyback': fetch_buyback}, timeout=70)
+    missing = [name for name, res in results.items() if not res.ok]
+    if missing:
+        print(f"   [WARNING] Data parsial, gagal ambil: {', '.join(missing)}")
+    metrics.inc('crawl_path_total', vendor='ubs', path='partial' if missing else 'complete')
+
+    print("\n[3/3] Menggabungkan Data...")
+    return merge_ubs(results['catalog'].data or {}, results['buyback'].data or {}, missing)
 
 def main():
     data = crawl_ubs_complete()
     
     if data:
-        df = pd.DataFrame(data)
         filename = f"Harga_UBS_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        df.to_excel(filename, index=False)
+        with open(filename, 'wb') as f:
+            write_xlsx({'UBS': data}, f)
         
         print("\n" + "="*50)
         print(f"SUKSES! Data UBS tersimpan di: {filename}")
         print("="*50)
-        print(df)
+        for r in data:
+            print(r)
     else:
         print("Gagal mendapatkan data.")
 
@@ -0,0 +1,119 @@
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import metrics
+from orchestrator import VendorResult, crawl_all
+from records import PriceRow
+from result import CrawlResult
+
+# langkah fetch yang boleh dipakai crawler vendor (Vendor.fetch, dicoba berurutan)
+FETCH_HTTP = "http"       # GET halaman statis (http_client / ChangeTracker)
+FETCH_JSON = "json"       # endpoint JSON yang dipelajari dari render sebelumnya
+FETCH_RENDER = "render"   # browser Playwright (pool), fallback kalau langkah sebelumnya gagal
+
+OFF_HOURS_FACTOR = float(os.environ.get("SCHED_OFF_HOURS_FACTOR", "4"))  # di luar jam pasar: interval x4
+
+
+def key_gram(row: PriceRow) -> Tuple:
+    return (row.gramasi,)
+
+
+def key_vendor_gram(row: PriceRow) -> Tuple:
+    # Hartadinata punya beberapa kategori dengan gramasi yang sama
+    return (row.vendor, row.gramasi)
+
+
+@dataclass(frozen=True)
+class Vendor:
+    """
+    Deklarasi satu vendor. Semua jalur (web app, batch Excel, scheduler) dispatch lewat sini,
+    jadi modul vendor cukup di-import saat benar-benar dipakai. Dedup baris hanya di sini (dedup_key),
+    crawler / parser vendor cukup mengembalikan baris mentah.
+    """
+    id: str                       # id di URL: /get_price/<id>
+    name: str                     # label tampilan / nama sheet Excel
+    module: str                   # modul crawler
+    crawler: str                  # fungsi crawl() -> list baris harga
+    parser: str                   # fungsi parse(html) -> list baris harga (halaman tersimpan, benchmark)
+    fetch: Tuple[str, ...] = (FETCH_HTTP,)   # strategi fetch, dibaca crawl_* lewat fetch_strategy()
+    dedup_key: Callable[[PriceRow], Tuple] = key_gram
+    cache_ttl: float = 300.0      # detik data dianggap segar di cache
+    timeout: float = 60.0         # batas waktu crawl di orchestrator
+    refresh: float = 600.0        # interval scheduler di jam pasar (detik)
+
+    def scheduled_ttl(self) -> float:
+        """
+        Detik hasil crawl scheduler dianggap segar: sampai putaran berikutnya selesai
+        (jadwal terlama di luar jam pasar + jitter + timeout crawl), minimal cache_ttl.
+        """
+        return max(self.cache_ttl, self.refresh * OFF_HOURS_FACTOR * 1.1 + self.timeout)
+
+    def _func(self, attr: str) -> Callable:
+        return getattr(importlib.import_module(self.module), attr)
+
+    def crawl(self, save: bool = True) -> List[PriceRow]:
+        with metrics.vendor_scope(self.id), metrics.span("crawl"):
+            try:
+                rows = dedup_rows(self._func(self.crawler)(), self.dedup_key)
+            except Exception:
+                metrics.inc("crawl_errors_total", vendor=self.id)
+                raise
+        # halaman tidak berubah sejak crawl terakhir: baris yang sama sudah ada di store
+        if save and rows and not getattr(rows, "unchanged_since", None):
+            save_history(self.id, rows)
+        return rows
+
+    def parse(self, html: str) -> List[PriceRow]:
+        with metrics.vendor_scope(self.id):
+            return dedup_rows(self._func(self.parser)(html), self.dedup_key)
+
+
+@metrics.timed("dedup")
+def dedup_rows(rows: List[PriceRow], key: Callable[[PriceRow], Tuple]) -> List[PriceRow]:
+    """Baris terakhir menang per key, hasil diurutkan per key. Metadata CrawlResult ikut dibawa."""
+    dedup = {key(r): r for r in rows}
+    out = [dedup[k] for k in sorted(dedup)]
+    if isinstance(rows, CrawlResult):
+        res = CrawlResult(out)
+        res.__dict__.update(rows.__dict__)
+        return res
+    return out
+
+
+def save_history(vendor_id: str, rows: List[PriceRow]) -> None:
+    """Simpan hasil crawl ke price store. Gagal simpan tidak boleh menggagalkan crawl."""
+    from store import get_store
+    try:
+        get_store().save(vendor_id, rows)
+    except Exception as e:
+        print(f"[STORE] gagal simpan {vendor_id}: {e}")
+
+
+VENDORS: Dict[str, Vendor] = {v.id: v for v in (
+    Vendor("antam", "ANTAM", "antam", "crawl_antam", "antam_parse_table",
+           fetch=(FETCH_HTTP, FETCH_RENDER), cache_ttl=900, timeout=150, refresh=600),
+    Vendor("g24", "GALERI24", "g24", "crawl_g24_only", "parse_g24",
+           cache_ttl=900, timeout=40, refresh=600),
+    Vendor("hrta", "HARTADINATA", "hrta", "crawl_hartadinata", "parse_table",
+           fetch=(FETCH_JSON, FETCH_RENDER), dedup_key=key_vendor_gram, cache_ttl=600, timeout=120,
+           refresh=300),
+    Vendor("ubs", "UBS", "ubs", "crawl_ubs_complete", "parse_page",
+           cache_ttl=600, timeout=70, refresh=300),
+)}
+
+
+def get_vendor(vendor_id: str) -> Optional[Vendor]:
+    return VENDORS.get(vendor_id)
+
+
+def fetch_strategy(vendor_id: str) -> Tuple[str, ...]:
+    """Langkah fetch yang dideklarasikan registry untuk vendor ini (lihat FETCH_*)."""
+    return VENDORS[vendor_id].fetch
+
+
+def crawl_many(ids: Optional[Iterable[str]] = None) -> Dict[str, VendorResult]:
+    """Crawl beberapa vendor sekaligus (default: semua), masing-masing dengan timeout-nya sendiri."""
+    selected = [VENDORS[i] for i in (ids or VENDORS)]
+    return crawl_all({v.id: v.crawl for v in selected}, timeout={v.id: v.timeout for v in selected})